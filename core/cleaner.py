@@ -5,6 +5,7 @@ import os
 import threading
 import time
 import shutil
+import stat
 from datetime import datetime
 import shutil
 from enum import Enum
@@ -226,6 +227,9 @@ class Cleaner:
             
             # 打开文件并多次覆盖
             with open(file_path, "r+b") as f:
+                # 字符设备上fsync没有意义，跳过
+                is_char_device = stat.S_ISCHR(os.fstat(f.fileno()).st_mode)
+                
                 # 多次覆盖
                 for p in range(passes):
                     # 随机数据模式
@@ -246,8 +250,9 @@ class Cleaner:
                         f.write(bytes([pattern]) * write_size)
                         bytes_left -= write_size
                         
-                    # 刷新到磁盘
-                    f.flush()
+                # 只在最后一遍后刷新到磁盘
+                f.flush()
+                if not is_char_device:
                     os.fsync(f.fileno())
                     
             # 删除文件
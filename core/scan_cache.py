@@ -0,0 +1,183 @@
+"""
+扫描缓存模块，使用SQLite持久化目录列表，加速重复扫描
+"""
+import os
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+
+class ScanCache:
+    """扫描缓存类，按目录修改时间缓存目录内容列表"""
+
+    # 批量写入的行数
+    BATCH_SIZE = 1000
+
+    def __init__(self, cache_dir: str, file_name: str = "scan_cache.db"):
+        """
+        初始化扫描缓存
+
+        参数:
+            cache_dir (str): 缓存数据库所在目录
+            file_name (str): 缓存数据库文件名
+        """
+        self.db_path = os.path.join(cache_dir, file_name)
+        # 扫描在后台线程中进行，由锁保证同一时间只有一个线程访问连接
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pending_dirs = []  # 待写入的目录行 (path, mtime)
+        self._pending_entries = []  # 待写入的目录内容行 (dir, path, is_dir)
+        self._pending_dir_paths = set()  # 有待写入行的目录
+        self._create_tables()
+
+    def _create_tables(self):
+        """创建缓存表"""
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (path TEXT PRIMARY KEY, dir TEXT, is_dir INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_entries_dir ON entries (dir)"
+            )
+            self._conn.commit()
+
+    def get_dir_mtime(self, directory: str) -> Optional[int]:
+        """
+        获取缓存的目录修改时间
+
+        参数:
+            directory (str): 目录路径
+
+        返回:
+            int: 修改时间(纳秒)，未缓存时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime FROM dirs WHERE path = ?", (directory,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_dir_entries(self, directory: str) -> Tuple[List[str], List[str]]:
+        """
+        获取缓存的目录内容
+
+        参数:
+            directory (str): 目录路径
+
+        返回:
+            Tuple[List[str], List[str]]: (文件路径列表, 子目录路径列表)
+        """
+        files = []
+        subdirs = []
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, is_dir FROM entries WHERE dir = ?", (directory,)
+            ).fetchall()
+
+        for path, is_dir in rows:
+            if is_dir:
+                subdirs.append(path)
+            else:
+                files.append(path)
+
+        return files, subdirs
+
+    def update_dir(self, directory: str, mtime: int, files: List[str], subdirs: List[str]):
+        """
+        更新目录的缓存内容，写入会按批次进行
+
+        参数:
+            directory (str): 目录路径
+            mtime (int): 目录修改时间(纳秒)
+            files (List[str]): 文件路径列表
+            subdirs (List[str]): 子目录路径列表
+        """
+        with self._lock:
+            # 同一批次中已更新过该目录时先写入，否则下面的查询和删除看不到这些行，旧行会在之后被重新写入
+            if directory in self._pending_dir_paths:
+                self._flush()
+
+            # 清除已不存在的子目录及其下层的缓存行，避免数据库不断增长
+            old_subdirs = self._conn.execute(
+                "SELECT path FROM entries WHERE dir = ? AND is_dir = 1", (directory,)
+            ).fetchall()
+            removed = {row[0] for row in old_subdirs}.difference(subdirs)
+            if removed:
+                self._flush()
+                for path in removed:
+                    self._prune_dir(path)
+
+            self._conn.execute("DELETE FROM entries WHERE dir = ?", (directory,))
+
+            self._pending_entries.extend((directory, path, 0) for path in files)
+            self._pending_entries.extend((directory, path, 1) for path in subdirs)
+            self._pending_dirs.append((directory, mtime))
+            self._pending_dir_paths.add(directory)
+
+            if len(self._pending_entries) >= self.BATCH_SIZE:
+                self._flush()
+
+    def _prune_dir(self, directory: str):
+        """
+        删除目录及其所有下层目录的缓存行（调用方需持有锁）
+
+        参数:
+            directory (str): 目录路径
+        """
+        # 用区间比较匹配以"目录+分隔符"开头的路径，可使用索引且无需转义LIKE通配符
+        low = directory + os.sep
+        high = directory + chr(ord(os.sep) + 1)
+        self._conn.execute(
+            "DELETE FROM entries WHERE dir = ? OR (dir >= ? AND dir < ?)",
+            (directory, low, high)
+        )
+        self._conn.execute(
+            "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+            (directory, low, high)
+        )
+
+    def _flush(self):
+        """批量写入待写入的行（调用方需持有锁）"""
+        if self._pending_entries:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (dir, path, is_dir) VALUES (?, ?, ?)",
+                self._pending_entries
+            )
+            self._pending_entries = []
+
+        if self._pending_dirs:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs (path, mtime) VALUES (?, ?)",
+                self._pending_dirs
+            )
+            self._pending_dirs = []
+
+        self._pending_dir_paths.clear()
+
+    def commit(self):
+        """写入所有待写入的行并提交事务"""
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+
+    def clear(self):
+        """清除所有缓存内容"""
+        with self._lock:
+            self._pending_dirs = []
+            self._pending_entries = []
+            self._pending_dir_paths.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM dirs")
+            self._conn.commit()
+
+    def close(self):
+        """提交并关闭数据库连接，重复调用时不做任何操作"""
+        if self._conn is None:
+            return
+        self.commit()
+        with self._lock:
+            self._conn.close()
+            self._conn = None
@@ -8,6 +8,12 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Callable, Optional, Tuple
 import re
 
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick为可选依赖，不可用时使用str.endswith匹配
+    ahocorasick = None
+
 from utils.system_utils import SystemUtils
 
 class ScanFilter:
@@ -32,6 +38,56 @@ class ScanFilter:
         self.extensions = extensions or []
         self.exclude_exts = exclude_exts or []
         
+        # 每次扫描只预编译一次扩展名匹配器
+        self._ext_matcher = self._build_suffix_matcher(self.extensions)
+        self._exclude_matcher = self._build_suffix_matcher(self.exclude_exts)
+        
+    @staticmethod
+    def _build_suffix_matcher(suffixes: List[str]):
+        """
+        将后缀列表编译为匹配器
+        
+        参数:
+            suffixes (List[str]): 后缀列表
+            
+        返回:
+            匹配器对象，安装了pyahocorasick时为反转后缀构建的自动机，否则为小写后缀元组
+        """
+        if not suffixes:
+            return None
+            
+        suffixes = tuple(suffix.lower() for suffix in suffixes if suffix)
+        if ahocorasick is None or not suffixes:
+            return suffixes
+            
+        automaton = ahocorasick.Automaton()
+        for suffix in suffixes:
+            # 反转后缀，后缀匹配即变为对反转文件名的前缀匹配
+            automaton.add_word(suffix[::-1], suffix)
+        automaton.make_automaton()
+        return automaton
+        
+    @staticmethod
+    def _match_suffix(matcher, filename: str) -> bool:
+        """
+        检查文件名是否以匹配器中的任一后缀结尾
+        
+        参数:
+            matcher: _build_suffix_matcher返回的匹配器
+            filename (str): 小写文件名
+            
+        返回:
+            bool: 是否匹配
+        """
+        if isinstance(matcher, tuple):
+            return filename.endswith(matcher)
+            
+        for end_index, suffix in matcher.iter(filename[::-1]):
+            # 只有从反转文件名开头开始的匹配才是后缀匹配
+            if end_index == len(suffix) - 1:
+                return True
+        return False
+        
     def match_file(self, file_path: str, file_size: int, mod_time: datetime) -> bool:
         """
         检查文件是否符合过滤条件
@@ -57,15 +113,15 @@ class ScanFilter:
                 return False
                 
         # 检查文件扩展名
-        if self.extensions or self.exclude_exts:
-            ext = os.path.splitext(file_path)[1].lower()
+        if self._ext_matcher or self._exclude_matcher:
+            filename = os.path.basename(file_path).lower()
             
-            # 如果指定了包含的扩展名，则文件扩展名必须在列表中
-            if self.extensions and ext not in self.extensions:
+            # 如果指定了包含的扩展名，则文件名必须以其中之一结尾
+            if self._ext_matcher and not self._match_suffix(self._ext_matcher, filename):
                 return False
                 
-            # 如果指定了排除的扩展名，则文件扩展名不能在列表中
-            if self.exclude_exts and ext in self.exclude_exts:
+            # 如果指定了排除的扩展名，则文件名不能以其中之一结尾
+            if self._exclude_matcher and self._match_suffix(self._exclude_matcher, filename):
                 return False
                 
         return True
@@ -252,6 +308,7 @@ class Scanner:
         self.running = False
         self.scan_thread = None
         self.abort_flag = False
+        self.cache = None  # 扫描缓存(ScanCache)，为None时不使用缓存
         
     def add_target(self, target: ScanTarget):
         """
@@ -421,24 +478,29 @@ class Scanner:
         
     def scan(self, filter_obj: Optional[ScanFilter] = None,
             progress_callback: Callable[[int, int, int], None] = None, 
-            complete_callback: Callable[[List[ScanResult]], None] = None):
+            complete_callback: Callable[[List[ScanResult], Dict[str, Any]], None] = None,
+            cache=None,
+            result_callback: Callable[[ScanResult], None] = None):
         """
         开始扫描，在新线程中执行
         
         参数:
             filter_obj (ScanFilter): 全局过滤器对象
             progress_callback (callable): 进度回调函数，参数为(当前进度, 总进度, 百分比)
-            complete_callback (callable): 完成回调函数，参数为扫描结果列表
+            complete_callback (callable): 完成回调函数，参数为(扫描结果列表, 结果摘要)
+            cache (ScanCache): 扫描缓存，目录未变化时复用上次的目录列表
+            result_callback (callable): 单个目标扫描完成的回调函数，参数为该目标的扫描结果
         """
         if self.running:
             return False
             
         # 开始扫描线程
         self.abort_flag = False
+        self.cache = cache
         self.running = True
         self.scan_thread = threading.Thread(
             target=self._scan_thread,
-            args=(filter_obj, progress_callback, complete_callback)
+            args=(filter_obj, progress_callback, complete_callback, result_callback)
         )
         self.scan_thread.daemon = True
         self.scan_thread.start()
@@ -447,7 +509,8 @@ class Scanner:
         
     def _scan_thread(self, filter_obj: Optional[ScanFilter],
                    progress_callback: Callable = None, 
-                   complete_callback: Callable = None):
+                   complete_callback: Callable = None,
+                   result_callback: Callable = None):
         """
         扫描线程函数
         
@@ -455,6 +518,7 @@ class Scanner:
             filter_obj (ScanFilter): 全局过滤器对象
             progress_callback (callable): 进度回调函数
             complete_callback (callable): 完成回调函数
+            result_callback (callable): 单个目标扫描完成的回调函数
         """
         self.results = []
         enabled_targets = [t for t in self.targets if t.enabled]
@@ -476,6 +540,9 @@ class Scanner:
             result = self._scan_target(target, filter_obj)
             self.results.append(result)
             
+            if result_callback:
+                result_callback(result)
+                
             # 更新进度
             progress_percent = int(current * 100 / total_targets)
             
@@ -485,11 +552,19 @@ class Scanner:
             # 添加小延时，避免占用过多资源
             time.sleep(0.1)
             
+        # 一次性提交缓存的写入
+        if self.cache is not None:
+            try:
+                self.cache.commit()
+            except Exception as e:
+                print(f"保存扫描缓存时出错: {str(e)}")
+                
         # 完成回调
         self.running = False
         
         if complete_callback:
-            complete_callback(self.results)
+            # 在扫描线程中计算摘要，界面线程只需显示
+            complete_callback(self.results, self.get_results_summary())
             
     def _scan_target(self, target: ScanTarget, filter_obj: Optional[ScanFilter]) -> ScanResult:
         """
@@ -527,28 +602,73 @@ class Scanner:
         """
         try:
             # 获取目录内容
-            items = os.listdir(directory)
+            files, subdirs = self._get_directory_entries(directory)
+        except (PermissionError, OSError):
+            # 忽略无权限目录
+            return
             
-            for item in items:
+        for file_path in files:
+            if self.abort_flag:
+                return
+                
+            self._process_file(target, file_path, result, filter_obj)
+            
+        # 处理目录（递归）
+        if target.recursive:
+            for subdir in subdirs:
                 if self.abort_flag:
-                    break
+                    return
                     
-                item_path = os.path.join(directory, item)
+                self._scan_directory(target, subdir, result, filter_obj)
                 
-                try:
-                    # 处理文件
-                    if os.path.isfile(item_path):
-                        self._process_file(target, item_path, result, filter_obj)
-                    # 处理目录（递归）
-                    elif os.path.isdir(item_path) and target.recursive:
-                        self._scan_directory(target, item_path, result, filter_obj)
-                except (PermissionError, OSError):
-                    # 忽略无权限文件/目录
-                    pass
-                    
-        except (PermissionError, OSError):
-            # 忽略无权限目录
-            pass
+    def _get_directory_entries(self, directory: str) -> Tuple[List[str], List[str]]:
+        """
+        获取目录中的文件和子目录，目录修改时间未变化时直接使用缓存
+        
+        参数:
+            directory (str): 目录路径
+            
+        返回:
+            Tuple[List[str], List[str]]: (文件路径列表, 子目录路径列表)
+        """
+        if self.cache is None:
+            return self._list_directory(directory)
+            
+        # 目录内容增删会更新目录的修改时间，未变化时无需重新列出
+        dir_mtime = os.stat(directory).st_mtime_ns
+        if self.cache.get_dir_mtime(directory) == dir_mtime:
+            return self.cache.get_dir_entries(directory)
+            
+        files, subdirs = self._list_directory(directory)
+        self.cache.update_dir(directory, dir_mtime, files, subdirs)
+        return files, subdirs
+        
+    def _list_directory(self, directory: str) -> Tuple[List[str], List[str]]:
+        """
+        列出目录中的文件和子目录
+        
+        参数:
+            directory (str): 目录路径
+            
+        返回:
+            Tuple[List[str], List[str]]: (文件路径列表, 子目录路径列表)
+        """
+        files = []
+        subdirs = []
+        
+        for item in os.listdir(directory):
+            item_path = os.path.join(directory, item)
+            
+            try:
+                if os.path.isfile(item_path):
+                    files.append(item_path)
+                elif os.path.isdir(item_path):
+                    subdirs.append(item_path)
+            except (PermissionError, OSError):
+                # 忽略无权限文件/目录
+                pass
+                
+        return files, subdirs
             
     def _process_file(self, target: ScanTarget, file_path: str, result: ScanResult, filter_obj: Optional[ScanFilter]):
         """
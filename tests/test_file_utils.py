@@ -0,0 +1,94 @@
+"""
+文件工具模块测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.file_utils import FileUtils
+
+
+class TestForceDeleteDirectory(unittest.TestCase):
+    """force_delete_directory 测试"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_deletes_directory_tree(self):
+        target = os.path.join(self.root, 'tree')
+        os.makedirs(os.path.join(target, 'sub'))
+        with open(os.path.join(target, 'sub', 'file.txt'), 'w') as f:
+            f.write('data')
+
+        self.assertTrue(FileUtils.force_delete_directory(target))
+        self.assertFalse(os.path.exists(target))
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), '需要符号链接支持')
+    def test_symlinked_root_keeps_target(self):
+        target = os.path.join(self.root, 'target')
+        link = os.path.join(self.root, 'link')
+        os.makedirs(os.path.join(target, 'sub'))
+        kept_file = os.path.join(target, 'sub', 'file.txt')
+        with open(kept_file, 'w') as f:
+            f.write('data')
+        try:
+            os.symlink(target, link, target_is_directory=True)
+        except OSError:
+            self.skipTest('无法创建符号链接')
+
+        self.assertFalse(FileUtils.force_delete_directory(link))
+        self.assertTrue(os.path.islink(link))
+        self.assertTrue(os.path.isfile(kept_file))
+
+    @unittest.skipUnless(os.name == 'nt', '目录联接仅在Windows上可用')
+    def test_junctions_keep_target(self):
+        import _winapi
+
+        target = os.path.join(self.root, 'target')
+        tree = os.path.join(self.root, 'tree')
+        os.makedirs(target)
+        os.makedirs(tree)
+        kept_file = os.path.join(target, 'file.txt')
+        with open(kept_file, 'w') as f:
+            f.write('data')
+        root_junction = os.path.join(self.root, 'junction')
+        _winapi.CreateJunction(target, root_junction)
+        _winapi.CreateJunction(target, os.path.join(tree, 'junction'))
+
+        self.assertFalse(FileUtils.force_delete_directory(root_junction))
+        self.assertTrue(FileUtils.force_delete_directory(tree))
+        self.assertFalse(os.path.exists(tree))
+        self.assertTrue(os.path.isfile(kept_file))
+
+
+
+class TestMakeBackup(unittest.TestCase):
+    """make_backup 测试"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.root, 'file.txt')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'data' * 1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    @unittest.skipUnless(hasattr(os, 'copy_file_range'), '需要os.copy_file_range')
+    def test_short_copy_file_range_falls_back(self):
+        with mock.patch.object(FileUtils, '_clone_file_linux', return_value=False), \
+                mock.patch('os.copy_file_range', return_value=0):
+            backup_path = FileUtils.make_backup(self.file_path)
+
+        self.assertIsNotNone(backup_path)
+        with open(backup_path, 'rb') as f:
+            self.assertEqual(f.read(), b'data' * 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+扫描缓存模块测试
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.scan_cache import ScanCache
+
+
+class TestScanCacheUpdateDir(unittest.TestCase):
+    """update_dir 测试"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ScanCache(self.cache_dir)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _count(self, table):
+        return self.cache._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_removed_subdir_rows_are_deleted(self):
+        root = os.path.join(os.sep, 'root')
+        sub = os.path.join(root, 'sub')
+        deep = os.path.join(sub, 'deep')
+        sibling = os.path.join(root, 'sub_keep')
+        self.cache.update_dir(root, 1, [], [sub, sibling])
+        self.cache.update_dir(sub, 1, [os.path.join(sub, 'a.txt')], [deep])
+        self.cache.update_dir(deep, 1, [os.path.join(deep, 'b.txt')], [])
+        self.cache.update_dir(sibling, 1, [os.path.join(sibling, 'c.txt')], [])
+        self.cache.commit()
+
+        self.cache.update_dir(root, 2, [], [sibling])
+        self.cache.commit()
+
+        self.assertIsNone(self.cache.get_dir_mtime(sub))
+        self.assertIsNone(self.cache.get_dir_mtime(deep))
+        self.assertEqual(self.cache.get_dir_entries(sibling), ([os.path.join(sibling, 'c.txt')], []))
+        self.assertEqual(self._count('dirs'), 2)
+        self.assertEqual(self._count('entries'), 2)
+
+    def test_update_same_dir_twice_before_commit(self):
+        root = os.path.join(os.sep, 'root')
+        sub = os.path.join(root, 'sub')
+        old_file = os.path.join(root, 'old.txt')
+        new_file = os.path.join(root, 'new.txt')
+        self.cache.update_dir(root, 1, [old_file], [sub])
+        self.cache.update_dir(sub, 1, [os.path.join(sub, 'a.txt')], [])
+        self.cache.update_dir(root, 2, [new_file], [])
+        self.cache.commit()
+
+        self.assertEqual(self.cache.get_dir_mtime(root), 2)
+        self.assertEqual(self.cache.get_dir_entries(root), ([new_file], []))
+        self.assertIsNone(self.cache.get_dir_mtime(sub))
+        self.assertEqual(self._count('entries'), 1)
+
+    def test_close_twice(self):
+        self.cache.close()
+        self.cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+"""
+大小工具模块测试
+"""
+import unittest
+
+from utils.size_utils import SizeUtils
+
+
+class TestGetSizeDistribution(unittest.TestCase):
+    """get_size_distribution 测试"""
+
+    def test_float_sizes_count_towards_total(self):
+        result = SizeUtils.get_size_distribution({'a': 1.5, 'b': 2})
+        self.assertEqual(result, {'a': (1.5, '42.9%'), 'b': (2, '57.1%')})
+
+    def test_invalid_sizes_are_zero_percent(self):
+        result = SizeUtils.get_size_distribution({'a': 1, 'b': -3, 'c': 3})
+        self.assertEqual(result, {'a': (1, '25%'), 'b': (-3, '0%'), 'c': (3, '75%')})
+
+
+
+class TestAddSizes(unittest.TestCase):
+    """add_sizes 测试"""
+
+    def test_counts_int_subclasses(self):
+        self.assertEqual(SizeUtils.add_sizes([1, 2.5, True, -4, 'x', None]), 4.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -264,6 +264,9 @@ class MainWindow(QMainWindow):
             # 停止定时器
             self.info_timer.stop()
             
+            # 关闭扫描缓存数据库
+            self.scan_tab.close_scan_cache()
+            
             event.accept()
         else:
             event.ignore()
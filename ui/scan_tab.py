@@ -5,17 +5,24 @@ import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QLabel, QCheckBox, QTreeWidget, QTreeWidgetItem, 
                             QProgressBar, QGroupBox, QSpinBox,
-                            QComboBox, QFileDialog, QMessageBox)
+                            QComboBox, QFileDialog, QMessageBox,
+                            QTreeWidgetItemIterator)
 from PyQt5.QtCore import Qt, pyqtSignal, QObject, pyqtSlot
 
 from core.scanner import Scanner, ScanTarget, ScanFilter
+from core.scan_cache import ScanCache
 from utils.system_utils import SystemUtils
-from utils.file_utils import FileUtils
+from utils.path_utils import PathUtils
+
+# 进度信号打包格式: 低28位为current，中间28位为total，高8位为percent
+_PROGRESS_FIELD_BITS = 28
+_PROGRESS_FIELD_MASK = (1 << _PROGRESS_FIELD_BITS) - 1
 
 class ScanUpdateSignals(QObject):
     """扫描更新信号类，用于线程间通信"""
-    progress_update = pyqtSignal(int, int, int)  # current, total, percent
-    scan_completed = pyqtSignal(list)  # 扫描结果列表
+    progress_update = pyqtSignal('quint64')  # 打包后的 current, total, percent
+    scan_completed = pyqtSignal(list, dict)  # 扫描结果列表, 结果摘要
+    result_ready = pyqtSignal(object)  # 单个目标的扫描结果
 
 class ScanTab(QWidget):
     """扫描选项卡类，实现垃圾文件扫描功能的界面"""
@@ -36,10 +43,21 @@ class ScanTab(QWidget):
         self.scanner = scanner
         self.parent = parent
         
+        # 上次显示在进度标签中的百分比
+        self._last_rendered_percent = -1
+        
         # 创建信号对象
         self.signals = ScanUpdateSignals()
         self.signals.progress_update.connect(self.update_progress)
         self.signals.scan_completed.connect(self.scan_completed_handler)
+        self.signals.result_ready.connect(self.append_result)
+        
+        # 创建扫描缓存，失败时不使用缓存
+        try:
+            self.scan_cache = ScanCache(PathUtils.get_app_cache_dir())
+        except Exception as e:
+            print(f"创建扫描缓存时出错: {str(e)}")
+            self.scan_cache = None
         
         # 初始化界面
         self.init_ui()
@@ -202,9 +220,14 @@ class ScanTab(QWidget):
         self.clean_button.clicked.connect(self.clean_selected)
         self.clean_button.setEnabled(False)
         
+        self.clear_cache_button = QPushButton("清除缓存")
+        self.clear_cache_button.clicked.connect(self.clear_scan_cache)
+        self.clear_cache_button.setEnabled(self.scan_cache is not None)
+        
         buttons_layout.addWidget(self.scan_button)
         buttons_layout.addWidget(self.stop_button)
         buttons_layout.addWidget(self.clean_button)
+        buttons_layout.addWidget(self.clear_cache_button)
         
         main_layout.addLayout(buttons_layout)
         
@@ -228,11 +251,14 @@ class ScanTab(QWidget):
                 
     def update_scanner_from_ui(self):
         """根据界面设置更新扫描器"""
-        # 更新目标启用状态
-        for i in range(self.targets_tree.topLevelItemCount()):
-            item = self.targets_tree.topLevelItem(i)
-            target = self.scanner.targets[i]
+        # 更新目标启用状态（目标列表只有一层，迭代顺序与目标顺序一致）
+        it = QTreeWidgetItemIterator(self.targets_tree)
+        for target in self.scanner.targets:
+            item = it.value()
+            if item is None:
+                break
             target.enabled = item.checkState(0) == Qt.Checked
+            it += 1
             
         # 获取过滤器参数
         min_size = self.min_size_spin.value()
@@ -283,7 +309,7 @@ class ScanTab(QWidget):
         """添加自定义扫描目标"""
         dir_path = QFileDialog.getExistingDirectory(
             self, "选择扫描目录", os.path.expanduser("~"),
-            QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks
+            QFileDialog.ShowDirsOnly
         )
         
         if dir_path:
@@ -312,57 +338,66 @@ class ScanTab(QWidget):
         if not selected_items:
             return
             
-        # 获取选中项的索引
-        indices = []
-        for item in selected_items:
-            index = self.targets_tree.indexOfTopLevelItem(item)
-            indices.append(index)
-            
-        # 按索引从大到小排序，这样删除时不会影响前面的索引
-        indices.sort(reverse=True)
-        
         # 确认删除
         reply = QMessageBox.question(
-            self, "确认删除", 
-            f"确定要删除选中的 {len(indices)} 个扫描目标吗？",
+            self, "确认删除",
+            f"确定要删除选中的 {len(selected_items)} 个扫描目标吗？",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
-        
+
         if reply != QMessageBox.Yes:
             return
-            
+
+        # 一次遍历求出需要保留的索引，避免逐个查找索引和逐个删除带来的平方复杂度
+        selected_ids = {id(item) for item in selected_items}
+        target_count = len(self.scanner.targets)
+        keep_indices = [
+            i for i in range(self.targets_tree.topLevelItemCount())
+            if id(self.targets_tree.topLevelItem(i)) not in selected_ids and i < target_count
+        ]
+
         # 删除目标
-        for index in indices:
-            # 防止索引越界
-            if 0 <= index < len(self.scanner.targets):
-                del self.scanner.targets[index]
-                
+        self.scanner.targets = [self.scanner.targets[i] for i in keep_indices]
+
         # 更新列表
         self.update_target_list()
         
     def select_all_targets(self):
         """选中所有扫描目标"""
-        for i in range(self.targets_tree.topLevelItemCount()):
-            item = self.targets_tree.topLevelItem(i)
-            item.setCheckState(0, Qt.Checked)
+        self._set_all_targets_check_state(Qt.Checked)
             
     def deselect_all_targets(self):
         """取消选中所有扫描目标"""
-        for i in range(self.targets_tree.topLevelItemCount()):
-            item = self.targets_tree.topLevelItem(i)
-            item.setCheckState(0, Qt.Unchecked)
+        self._set_all_targets_check_state(Qt.Unchecked)
+        
+    def _set_all_targets_check_state(self, state):
+        """
+        设置所有扫描目标的选中状态
+        
+        参数:
+            state (Qt.CheckState): 选中状态
+        """
+        # 暂停信号和重绘，避免每个项目都触发一次itemChanged和重绘
+        self.targets_tree.blockSignals(True)
+        self.targets_tree.setUpdatesEnabled(False)
+        
+        try:
+            for i in range(self.targets_tree.topLevelItemCount()):
+                item = self.targets_tree.topLevelItem(i)
+                item.setCheckState(0, state)
+        finally:
+            self.targets_tree.setUpdatesEnabled(True)
+            self.targets_tree.blockSignals(False)
+            
+        self.targets_tree.viewport().update()
             
     def start_scan(self):
         """开始扫描操作"""
-        # 确保至少有一个目标被选中
-        has_selected = False
-        for i in range(self.targets_tree.topLevelItemCount()):
-            item = self.targets_tree.topLevelItem(i)
-            if item.checkState(0) == Qt.Checked:
-                has_selected = True
-                break
-                
+        # 确保至少有一个目标被选中，由Qt在C++中查找第一个选中项
+        it = QTreeWidgetItemIterator(self.targets_tree, QTreeWidgetItemIterator.Checked)
+        has_selected = it.value() is not None
+        
         if not has_selected:
             QMessageBox.warning(self, "警告", "请至少选择一个扫描目标")
             return
@@ -373,6 +408,7 @@ class ScanTab(QWidget):
         # 更新界面状态
         self.progress_bar.setValue(0)
         self.progress_label.setText("正在扫描...")
+        self._last_rendered_percent = -1
         self.scan_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.clean_button.setEnabled(False)
@@ -387,7 +423,9 @@ class ScanTab(QWidget):
         self.scanner.scan(
             filter_obj=self.filter,
             progress_callback=self.progress_callback,
-            complete_callback=self.complete_callback
+            complete_callback=self.complete_callback,
+            cache=self.scan_cache,
+            result_callback=self.result_callback
         )
         
     def stop_scan(self):
@@ -401,34 +439,79 @@ class ScanTab(QWidget):
         if self.parent:
             self.parent.set_status("扫描已中止")
             
+    def clear_scan_cache(self):
+        """清除扫描缓存"""
+        if self.scan_cache is None:
+            return
+            
+        if self.scanner.is_running():
+            QMessageBox.warning(self, "警告", "扫描进行中，无法清除缓存")
+            return
+            
+        self.scan_cache.clear()
+        
+        # 设置父窗口状态
+        if self.parent:
+            self.parent.set_status("扫描缓存已清除")
+            
+    def close_scan_cache(self):
+        """关闭扫描缓存，在程序退出时调用"""
+        if self.scan_cache is None:
+            return
+            
+        # 先让扫描器停止使用缓存，再关闭数据库连接
+        self.scanner.cache = None
+        try:
+            self.scan_cache.close()
+        except Exception as e:
+            print(f"关闭扫描缓存时出错: {str(e)}")
+        self.scan_cache = None
+        
     def progress_callback(self, current, total, percent):
         """进度回调函数，将在后台线程中调用，发送信号到主线程"""
-        self.signals.progress_update.emit(current, total, percent)
+        # 打包为一个整数发送，减少跨线程传递的参数个数
+        packed = ((current & _PROGRESS_FIELD_MASK)
+                  | ((total & _PROGRESS_FIELD_MASK) << _PROGRESS_FIELD_BITS)
+                  | ((percent & 0xFF) << (2 * _PROGRESS_FIELD_BITS)))
+        self.signals.progress_update.emit(packed)
     
-    def complete_callback(self, results):
+    def result_callback(self, result):
+        """单个目标扫描完成的回调函数，将在后台线程中调用，发送信号到主线程"""
+        self.signals.result_ready.emit(result)
+        
+    def complete_callback(self, results, summary):
         """完成回调函数，将在后台线程中调用，发送信号到主线程"""
-        self.signals.scan_completed.emit(results)
+        self.signals.scan_completed.emit(results, summary)
         
-    @pyqtSlot(int, int, int)
-    def update_progress(self, current, total, percent):
+    @pyqtSlot('quint64')
+    def update_progress(self, packed):
         """
         更新扫描进度（在主线程中执行）
         
         参数:
-            current (int): 当前进度
-            total (int): 总进度
-            percent (int): 百分比
+            packed (int): 打包后的进度，包含当前进度、总进度和百分比
         """
+        current = packed & _PROGRESS_FIELD_MASK
+        total = (packed >> _PROGRESS_FIELD_BITS) & _PROGRESS_FIELD_MASK
+        percent = (packed >> (2 * _PROGRESS_FIELD_BITS)) & 0xFF
+        
         self.progress_bar.setValue(percent)
+        
+        # 百分比未变化时不更新标签，避免重新布局
+        if percent == self._last_rendered_percent:
+            return
+            
+        self._last_rendered_percent = percent
         self.progress_label.setText(f"正在扫描... {current}/{total} ({percent}%)")
         
-    @pyqtSlot(list)
-    def scan_completed_handler(self, results):
+    @pyqtSlot(list, dict)
+    def scan_completed_handler(self, results, summary):
         """
         扫描完成处理函数（在主线程中执行）
         
         参数:
             results (list): 扫描结果列表
+            summary (dict): 扫描线程中计算好的结果摘要
         """
         # 更新界面状态
         self.progress_bar.setValue(100)
@@ -437,7 +520,7 @@ class ScanTab(QWidget):
         self.stop_button.setEnabled(False)
         
         # 显示结果
-        self.show_scan_results(results)
+        self.show_scan_results(results, summary)
         
         # 发送扫描完成信号
         self.scan_completed.emit(results)
@@ -446,19 +529,16 @@ class ScanTab(QWidget):
         if self.parent:
             self.parent.set_status("扫描完成")
             
-    def show_scan_results(self, results):
+    def show_scan_results(self, results, summary):
         """
-        显示扫描结果
+        显示扫描结果统计，结果项已在扫描过程中逐个添加
         
         参数:
             results (list): 扫描结果列表
+            summary (dict): 结果摘要
         """
-        self.results_tree.clear()
-        
-        # 获取结果摘要
-        summary = self.scanner.get_results_summary()
+        # 读取结果摘要
         total_files = summary['total_files']
-        total_size = summary['total_size']
         formatted_size = summary['formatted_size']
         
         # 更新统计信息
@@ -468,36 +548,43 @@ class ScanTab(QWidget):
         if not results:
             return
             
-        # 添加结果到树
-        for result in results:
-            item = QTreeWidgetItem(self.results_tree)
-            item.setText(0, result.target.name)
-            item.setText(1, str(result.get_file_count()))
-            item.setText(2, result.get_formatted_size())
-            
-            # 系统目录标记
-            if result.target.is_system:
-                item.setBackground(0, Qt.yellow)
-                
-            # 添加文件子项
-            for file_path in result.files[:100]:  # 限制显示数量，避免过多
-                file_item = QTreeWidgetItem(item)
-                file_item.setText(0, os.path.basename(file_path))
-                file_item.setText(1, "")
-                file_size = FileUtils.get_file_size(file_path)
-                file_item.setText(2, SystemUtils.format_size(file_size))
-                
-            # 如果文件太多，添加省略提示
-            if len(result.files) > 100:
-                more_item = QTreeWidgetItem(item)
-                more_item.setText(0, f"... 还有 {len(result.files) - 100} 个文件未显示")
-                
-        # 展开第一级
-        self.results_tree.expandToDepth(0)
-        
         # 启用清理按钮
         self.clean_button.setEnabled(True)
         
+    @pyqtSlot(object)
+    def append_result(self, result):
+        """
+        添加单个目标的扫描结果到结果树（在主线程中执行）
+        
+        参数:
+            result (ScanResult): 扫描结果
+        """
+        item = QTreeWidgetItem(self.results_tree)
+        item.setText(0, result.target.name)
+        item.setText(1, str(result.get_file_count()))
+        item.setText(2, result.get_formatted_size())
+        
+        # 系统目录标记
+        if result.target.is_system:
+            item.setBackground(0, Qt.yellow)
+            
+        # 添加文件子项
+        for file_path in result.files[:100]:  # 限制显示数量，避免过多
+            file_item = QTreeWidgetItem(item)
+            file_item.setText(0, os.path.basename(file_path))
+            file_item.setText(1, "")
+            # 使用扫描时记录的大小，无需再次读取文件信息
+            file_size = result.file_info[file_path]['size']
+            file_item.setText(2, SystemUtils.format_size(file_size))
+            
+        # 如果文件太多，添加省略提示
+        if len(result.files) > 100:
+            more_item = QTreeWidgetItem(item)
+            more_item.setText(0, f"... 还有 {len(result.files) - 100} 个文件未显示")
+            
+        # 展开第一级
+        item.setExpanded(True)
+        
     def clean_selected(self):
         """清理选中的项目"""
         # 获取选中的结果
@@ -0,0 +1,20 @@
+"""
+环境路径模块，在导入时解析一次用户主目录和常用的系统环境变量
+
+这些值在进程运行期间不会改变，供路径和系统工具直接使用，避免重复调用expanduser和读取环境变量
+"""
+import os
+
+# 用户主目录
+HOME = os.path.expanduser('~')
+
+# Windows应用程序数据目录
+APPDATA = os.environ.get('APPDATA') or os.path.join(HOME, 'AppData', 'Roaming')
+LOCALAPPDATA = os.environ.get('LOCALAPPDATA') or os.path.join(HOME, 'AppData', 'Local')
+
+# Windows系统目录
+WINDIR = os.environ.get('WINDIR', 'C:\\Windows')
+SYSTEMROOT = os.environ.get('SYSTEMROOT', 'C:\\Windows')
+SYSTEMDRIVE = os.environ.get('SYSTEMDRIVE', 'C:')
+PROGRAMFILES = os.environ.get('PROGRAMFILES', 'C:\\Program Files')
+PROGRAMFILES_X86 = os.environ.get('PROGRAMFILES(X86)', 'C:\\Program Files (x86)')
@@ -4,7 +4,6 @@
 import os
 import shutil
 import hashlib
-import send2trash
 import time
 from pathlib import Path
 from datetime import datetime
@@ -16,46 +15,172 @@ import logging
 import mimetypes
 import chardet
 import tempfile
+import io
 import json
+import subprocess
 import zipfile
 import tarfile
-import random
+import gzip
+import bz2
+import lzma
+import secrets
 import string
 import struct
-import math
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import send2trash
+except ImportError:
+    send2trash = None
+
+try:
+    import winshell
+except ImportError:
+    winshell = None
+
+try:
+    import re2
+except ImportError:
+    # re2为可选依赖，不可用时使用标准库re
+    re2 = None
+
+try:
+    import numpy as np
+    # PCG64生成器，用于快速生成覆盖文件的随机数据
+    _rng = np.random.default_rng()
+except ImportError:
+    _rng = None
+
+# 只在导入时加载一次系统的MIME类型数据库
+mimetypes.init()
 
 class FileUtils:
     """文件工具类，提供各种文件操作函数"""
     
+    # 已经压缩过的文件扩展名，再次压缩几乎没有收益
+    _INCOMPRESSIBLE = frozenset({
+        'jpg', 'jpeg', 'png', 'gif', 'webp', 'mp3', 'aac', 'mp4', 'mkv', 'webm',
+        'zip', 'gz', 'xz', 'bz2', '7z', 'rar', 'zst'
+    })
+    
+    # tar归档读写时使用的缓冲区大小
+    _TAR_BUFFER_SIZE = 2 * 1024 * 1024
+    
+    # 解压缩归档时读取缓冲区的大小
+    _READ_BUFFER_SIZE = 4 * 1024 * 1024
+    
+    # 按扩展名选择解压缩器
+    _DECOMPRESSORS = {
+        '.gz': gzip.open,
+        '.bz2': bz2.open,
+        '.xz': lzma.open
+    }
+    
+    # 常见的文本文件扩展名
+    _TEXT_EXTS = frozenset({
+        'txt', 'log', 'ini', 'cfg', 'conf', 'json', 'xml', 'htm', 'html', 
+        'css', 'js', 'py', 'java', 'c', 'cpp', 'h', 'cs', 'php', 'pl', 
+        'sh', 'bat', 'cmd', 'md', 'csv', 'tsv'
+    })
+    
+    # 检查文件健康时按扩展名匹配的文件头魔数
+    _MAGICS = {
+        '.png': (b'\x89PNG\r\n\x1a\n',),
+        '.jpg': (b'\xff\xd8\xff',),
+        '.jpeg': (b'\xff\xd8\xff',),
+        '.gif': (b'GIF87a', b'GIF89a'),
+        '.bmp': (b'BM',),
+        '.pdf': (b'%PDF',)
+    }
+    
+    # 按扩展名选择的文件健康检查方法
+    _HEALTH_CHECKERS = {
+        '.zip': '_check_zip_health',
+        '.png': '_check_image_health',
+        '.jpg': '_check_image_health',
+        '.jpeg': '_check_image_health',
+        '.gif': '_check_image_health',
+        '.bmp': '_check_image_health',
+        '.pdf': '_check_magic_health'
+    }
+    
+    # Linux上的FICLONE ioctl请求码
+    _FICLONE = 0x40049409
+    
+    # Windows ReFS块克隆相关的控制码和卷标志
+    _FSCTL_DUPLICATE_EXTENTS_TO_FILE = 0x00098344
+    _FSCTL_GET_INTEGRITY_INFORMATION = 0x0009027C
+    _FSCTL_SET_SPARSE = 0x000900C4
+    _FILE_SUPPORTS_BLOCK_REFCOUNTING = 0x08000000
+    
+    # 支持的哈希算法
+    _HASH_FACTORIES = {
+        'md5': hashlib.md5,
+        'sha1': hashlib.sha1,
+        'sha256': hashlib.sha256
+    }
+    
     @staticmethod
-    def get_file_size(file_path: str) -> int:
+    def stat(file_path: str) -> Optional[os.stat_result]:
         """
-        获取文件大小
+        获取文件的stat信息，可传给get_file_size等函数，避免重复调用os.stat
         
         参数:
             file_path (str): 文件路径
             
+        返回:
+            os.stat_result: 文件的stat信息，失败返回None
+        """
+        try:
+            return os.stat(file_path)
+        except (FileNotFoundError, PermissionError, OSError):
+            return None
+            
+    @staticmethod
+    def _as_stat(path_or_stat) -> os.stat_result:
+        """
+        将文件路径或stat信息统一为stat信息
+        
+        参数:
+            path_or_stat (str | os.stat_result): 文件路径或stat信息
+            
+        返回:
+            os.stat_result: stat信息
+        """
+        if isinstance(path_or_stat, os.stat_result):
+            return path_or_stat
+        return os.stat(path_or_stat)
+        
+    @staticmethod
+    def get_file_size(file_path) -> int:
+        """
+        获取文件大小
+        
+        参数:
+            file_path (str | os.stat_result): 文件路径或已获取的stat信息
+            
         返回:
             int: 文件大小（字节）
         """
         try:
-            return os.path.getsize(file_path)
+            return FileUtils._as_stat(file_path).st_size
         except (FileNotFoundError, PermissionError, OSError):
             return 0
             
     @staticmethod
-    def get_file_modified_time(file_path: str) -> Optional[datetime]:
+    def get_file_modified_time(file_path) -> Optional[datetime]:
         """
         获取文件修改时间
         
         参数:
-            file_path (str): 文件路径
+            file_path (str | os.stat_result): 文件路径或已获取的stat信息
             
         返回:
             datetime: 文件修改时间
         """
         try:
-            mtime = os.path.getmtime(file_path)
+            mtime = FileUtils._as_stat(file_path).st_mtime
             return datetime.fromtimestamp(mtime)
         except (FileNotFoundError, PermissionError, OSError):
             return None
@@ -87,26 +212,47 @@ class FileUtils:
         返回:
             bool: 操作是否成功
         """
+        return FileUtils.move_many_to_trash([file_path])
+        
+    @staticmethod
+    def move_many_to_trash(file_paths: List[str]) -> bool:
+        """
+        批量将文件移动到回收站，所有文件通过一次系统调用完成
+        
+        参数:
+            file_paths (List[str]): 文件路径列表
+            
+        返回:
+            bool: 操作是否成功
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return True
+            
         try:
-            # 使用send2trash库（需要安装）
-            try:
-                import send2trash
-                send2trash.send2trash(file_path)
+            # 使用send2trash库（需要安装），传入列表时在Windows上由一次IFileOperation完成
+            if send2trash is not None:
+                # 单个路径直接传入字符串，兼容不支持列表参数的旧版send2trash
+                send2trash.send2trash(file_paths[0] if len(file_paths) == 1 else file_paths)
                 return True
-            except ImportError:
+            else:
                 # 如果send2trash不可用，尝试使用原生方式
                 if os.name == 'nt':  # Windows
-                    import winshell
+                    if winshell is None:
+                        raise ImportError("需要安装send2trash或winshell")
                     try:
-                        winshell.delete_file(file_path, no_confirm=True, allow_undo=True)
+                        # SHFileOperation一次接受多个路径
+                        winshell.delete_file(file_paths, no_confirm=True, allow_undo=True)
                         return True
                     except:
                         # 降级为直接删除
-                        os.unlink(file_path)
+                        for file_path in file_paths:
+                            os.unlink(file_path)
                         return True
                 else:  # Linux/Mac
                     # 在Linux/Mac上，如果没有send2trash，就直接删除
-                    os.unlink(file_path)
+                    for file_path in file_paths:
+                        os.unlink(file_path)
                     return True
         except Exception as e:
             print(f"移动文件到回收站失败: {str(e)}")
@@ -132,41 +278,42 @@ class FileUtils:
                 os.unlink(file_path)
                 return True
                 
-            # 打开文件
-            with open(file_path, "rb+") as f:
+            # 每次写入1MB，减少系统调用次数
+            chunk_size = min(file_size, 1024 * 1024)
+            
+            fd = os.open(file_path, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                # 字符设备上fsync没有意义，跳过
+                is_char_device = stat.S_ISCHR(os.fstat(fd).st_mode)
+                
                 # 多次覆盖文件内容
                 for i in range(passes):
-                    # 定位到文件开始
-                    f.seek(0)
-                    
                     # 使用不同的字节模式覆盖
                     if i == 0:
                         # 第一遍用0覆盖
-                        pattern = b'\x00'
+                        pattern = b'\x00' * chunk_size
                     elif i == 1:
                         # 第二遍用1覆盖
-                        pattern = b'\xFF'
+                        pattern = b'\xFF' * chunk_size
                     else:
                         # 其他遍用随机数据覆盖
-                        import random
-                        pattern = bytes([random.randint(0, 255) for _ in range(min(4096, file_size))])
+                        pattern = FileUtils._random_bytes(chunk_size)
+                        
+                    view = memoryview(pattern)
                     
-                    # 写入覆盖数据
+                    # 定位到文件开始并写入覆盖数据
+                    os.lseek(fd, 0, os.SEEK_SET)
                     remaining = file_size
-                    pattern_size = len(pattern)
                     
                     while remaining > 0:
-                        chunk_size = min(remaining, pattern_size)
-                        if chunk_size < pattern_size:
-                            f.write(pattern[:chunk_size])
-                        else:
-                            f.write(pattern)
-                        remaining -= chunk_size
-                    
-                    # 刷新到磁盘
-                    f.flush()
-                    os.fsync(f.fileno())
-                    
+                        remaining -= os.write(fd, view[:min(remaining, chunk_size)])
+                        
+                # 只在最后一遍后刷新到磁盘，只同步数据不同步元数据
+                if not is_char_device:
+                    FileUtils._sync_data(fd)
+            finally:
+                os.close(fd)
+                
             # 最后删除文件
             os.unlink(file_path)
             return True
@@ -175,6 +322,40 @@ class FileUtils:
             print(f"安全删除文件失败: {str(e)}")
             return False
             
+    @staticmethod
+    def _random_bytes(size: int) -> bytes:
+        """
+        生成随机字节，优先使用numpy的PCG64生成器，不可用时由操作系统的随机数生成器提供
+        
+        参数:
+            size (int): 字节数
+            
+        返回:
+            bytes: 随机字节
+        """
+        if _rng is not None:
+            return _rng.bytes(size)
+            
+        if hasattr(os, 'getrandom'):
+            data = os.getrandom(size)
+            # 被信号中断时getrandom可能返回不足的字节数
+            if len(data) == size:
+                return data
+        return secrets.token_bytes(size)
+        
+    @staticmethod
+    def _sync_data(fd: int):
+        """
+        将文件数据刷新到磁盘，优先使用不刷新元数据的fdatasync
+        
+        参数:
+            fd (int): 文件描述符
+        """
+        if hasattr(os, 'fdatasync'):
+            os.fdatasync(fd)
+        else:
+            os.fsync(fd)
+            
     @staticmethod
     def delete_file(file_path: str) -> bool:
         """
@@ -248,13 +429,217 @@ class FileUtils:
         try:
             if os.path.exists(file_path):
                 backup_path = file_path + backup_suffix
-                shutil.copy2(file_path, backup_path)
+                src_stat = os.stat(file_path)
+                
+                FileUtils._copy_file_fast(file_path, backup_path)
+                
+                # 使用同一个stat结果保留权限和时间
+                os.chmod(backup_path, stat.S_IMODE(src_stat.st_mode))
+                os.utime(backup_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
                 return backup_path
             return None
         except Exception as e:
             print(f"创建文件备份失败: {str(e)}")
             return None
             
+    @staticmethod
+    def _copy_file_fast(src_path: str, dst_path: str):
+        """
+        复制文件内容，优先使用块克隆或由内核完成的零拷贝方式
+        
+        Linux上先尝试FICLONE（btrfs/XFS上只复制元数据），再使用os.copy_file_range；
+        Windows上先尝试ReFS块克隆，再使用CopyFile2，都不可用时退回shutil.copyfile。
+        
+        参数:
+            src_path (str): 源文件路径
+            dst_path (str): 目标文件路径
+        """
+        if hasattr(os, 'copy_file_range'):
+            try:
+                fd_in = os.open(src_path, os.O_RDONLY)
+                try:
+                    fd_out = os.open(dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    try:
+                        copied_all = True
+                        if not FileUtils._clone_file_linux(fd_in, fd_out):
+                            copied = 0
+                            while True:
+                                n = os.copy_file_range(fd_in, fd_out, 1 << 30)
+                                if not n:
+                                    break
+                                copied += n
+                                
+                            # procfs、部分FUSE/overlay及跨文件系统复制时可能提前返回0，需核对大小
+                            if copied != os.fstat(fd_in).st_size:
+                                os.ftruncate(fd_out, 0)
+                                copied_all = False
+                    finally:
+                        os.close(fd_out)
+                finally:
+                    os.close(fd_in)
+                if copied_all:
+                    return
+            except OSError:
+                # 内核或文件系统不支持，退回普通复制
+                pass
+        elif os.name == 'nt':
+            try:
+                if FileUtils._clone_file_windows(src_path, dst_path):
+                    return
+            except (AttributeError, OSError):
+                pass
+                
+            try:
+                import ctypes
+                copy_file2 = ctypes.windll.kernel32.CopyFile2
+                if copy_file2(ctypes.c_wchar_p(src_path), ctypes.c_wchar_p(dst_path), None) == 0:
+                    return
+            except (AttributeError, OSError):
+                # Windows 8以下没有CopyFile2
+                pass
+                
+        shutil.copyfile(src_path, dst_path)
+        
+    @staticmethod
+    def _clone_file_linux(fd_in: int, fd_out: int) -> bool:
+        """
+        使用FICLONE让目标文件与源文件共享数据块
+        
+        参数:
+            fd_in (int): 源文件描述符
+            fd_out (int): 目标文件描述符
+            
+        返回:
+            bool: 是否克隆成功，文件系统不支持时返回False
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+            
+        import fcntl
+        try:
+            fcntl.ioctl(fd_out, FileUtils._FICLONE, fd_in)
+            return True
+        except OSError:
+            return False
+            
+    @staticmethod
+    def _clone_file_windows(src_path: str, dst_path: str) -> bool:
+        """
+        在ReFS卷上使用FSCTL_DUPLICATE_EXTENTS_TO_FILE进行块克隆，只复制元数据
+        
+        参数:
+            src_path (str): 源文件路径
+            dst_path (str): 目标文件路径
+            
+        返回:
+            bool: 是否克隆成功，卷不支持块克隆时返回False
+        """
+        import ctypes
+        from ctypes import wintypes
+        
+        class DuplicateExtentsData(ctypes.Structure):
+            _fields_ = [
+                ('FileHandle', wintypes.HANDLE),
+                ('SourceFileOffset', ctypes.c_longlong),
+                ('TargetFileOffset', ctypes.c_longlong),
+                ('ByteCount', ctypes.c_longlong)
+            ]
+            
+        class IntegrityInformation(ctypes.Structure):
+            _fields_ = [
+                ('ChecksumAlgorithm', wintypes.WORD),
+                ('Reserved', wintypes.WORD),
+                ('Flags', wintypes.DWORD),
+                ('ChecksumChunkSizeInBytes', wintypes.DWORD),
+                ('ClusterSizeInBytes', wintypes.DWORD)
+            ]
+            
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.CreateFileW.argtypes = (
+            wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+            wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE
+        )
+        kernel32.DeviceIoControl.argtypes = (
+            wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+            wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID
+        )
+        kernel32.GetVolumeInformationByHandleW.argtypes = (
+            wintypes.HANDLE, wintypes.LPWSTR, wintypes.DWORD, wintypes.LPDWORD,
+            wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPWSTR, wintypes.DWORD
+        )
+        kernel32.SetFilePointerEx.argtypes = (
+            wintypes.HANDLE, ctypes.c_longlong, ctypes.POINTER(ctypes.c_longlong), wintypes.DWORD
+        )
+        kernel32.SetEndOfFile.argtypes = (wintypes.HANDLE,)
+        kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+        invalid_handle = wintypes.HANDLE(-1).value
+        
+        src_stat = os.stat(src_path)
+        file_size = src_stat.st_size
+        if file_size == 0:
+            return False
+            
+        # GENERIC_READ, FILE_SHARE_READ, OPEN_EXISTING
+        h_src = kernel32.CreateFileW(src_path, 0x80000000, 0x1, None, 3, 0, None)
+        if h_src == invalid_handle:
+            return False
+            
+        try:
+            # 检查卷是否支持块克隆
+            fs_flags = wintypes.DWORD()
+            if not kernel32.GetVolumeInformationByHandleW(
+                    h_src, None, 0, None, None, ctypes.byref(fs_flags), None, 0):
+                return False
+            if not fs_flags.value & FileUtils._FILE_SUPPORTS_BLOCK_REFCOUNTING:
+                return False
+                
+            # 克隆区域需要按簇对齐，从ReFS的完整性信息中获取簇大小
+            returned = wintypes.DWORD()
+            integrity = IntegrityInformation()
+            if not kernel32.DeviceIoControl(
+                    h_src, FileUtils._FSCTL_GET_INTEGRITY_INFORMATION, None, 0,
+                    ctypes.byref(integrity), ctypes.sizeof(integrity), ctypes.byref(returned), None):
+                return False
+            cluster_size = integrity.ClusterSizeInBytes
+            
+            # GENERIC_READ | GENERIC_WRITE, CREATE_ALWAYS
+            h_dst = kernel32.CreateFileW(dst_path, 0xC0000000, 0, None, 2, 0, None)
+            if h_dst == invalid_handle:
+                return False
+                
+            try:
+                # 稀疏的源文件要求目标文件也是稀疏文件
+                if getattr(src_stat, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_SPARSE_FILE:
+                    if not kernel32.DeviceIoControl(
+                            h_dst, FileUtils._FSCTL_SET_SPARSE, None, 0,
+                            None, 0, ctypes.byref(returned), None):
+                        return False
+                        
+                # 先将目标文件扩展到源文件大小
+                if not (kernel32.SetFilePointerEx(h_dst, file_size, None, 0)
+                        and kernel32.SetEndOfFile(h_dst)):
+                    return False
+                    
+                # 末尾不足一个簇的部分向上取整，每次最多克隆1GB
+                clone_size = (file_size + cluster_size - 1) // cluster_size * cluster_size
+                offset = 0
+                while offset < clone_size:
+                    extents = DuplicateExtentsData(
+                        h_src, offset, offset, min(1 << 30, clone_size - offset)
+                    )
+                    if not kernel32.DeviceIoControl(
+                            h_dst, FileUtils._FSCTL_DUPLICATE_EXTENTS_TO_FILE,
+                            ctypes.byref(extents), ctypes.sizeof(extents),
+                            None, 0, ctypes.byref(returned), None):
+                        return False
+                    offset += extents.ByteCount
+                return True
+            finally:
+                kernel32.CloseHandle(h_dst)
+        finally:
+            kernel32.CloseHandle(h_src)
+            
     @staticmethod
     def create_empty_file(file_path: str) -> bool:
         """
@@ -339,13 +724,121 @@ class FileUtils:
             str: 文件的MIME类型
         """
         try:
-            import mimetypes
             mime_type, _ = mimetypes.guess_type(file_path)
             return mime_type or "application/octet-stream"
         except:
             # 如果无法确定，返回通用二进制类型
             return "application/octet-stream"
             
+    @staticmethod
+    def _scandir_recursive(directory: str, recursive: bool = True):
+        """
+        使用os.scandir遍历目录，产生DirEntry对象
+        
+        DirEntry会缓存目录读取时得到的文件类型信息，is_file()/is_dir()通常无需额外的系统调用。
+        与os.walk一致，不进入指向目录的符号链接，也不进入Windows目录联接，无法访问的子目录会被跳过。
+        
+        参数:
+            directory (str): 目录路径
+            recursive (bool): 是否递归遍历子目录
+            
+        返回:
+            Iterator[os.DirEntry]: 文件和目录的DirEntry
+        """
+        stack = [directory]
+        
+        while stack:
+            current = stack.pop()
+            
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        yield entry
+                        
+                        try:
+                            if (recursive and entry.is_dir(follow_symlinks=False)
+                                    and not FileUtils._is_junction_entry(entry)):
+                                stack.append(entry.path)
+                        except OSError:
+                            pass
+            except OSError:
+                # 忽略无法访问的目录
+                continue
+                
+    @staticmethod
+    def _is_junction_entry(entry) -> bool:
+        """
+        判断DirEntry是否为Windows目录联接等重解析点
+        
+        Python 3.12之前，目录联接的is_dir(follow_symlinks=False)返回True而is_symlink()返回False，
+        需要检查文件属性，以免进入联接的目标。Windows上DirEntry的stat信息来自目录读取，无需额外系统调用。
+        
+        参数:
+            entry (os.DirEntry): 目录项
+            
+        返回:
+            bool: 是否为重解析点
+        """
+        if os.name != 'nt':
+            return False
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            return False
+        return bool(getattr(st, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+        
+    @staticmethod
+    def _is_junction(path: str) -> bool:
+        """
+        判断路径是否为Windows目录联接等重解析点
+        
+        参数:
+            path (str): 路径
+            
+        返回:
+            bool: 是否为重解析点
+        """
+        if os.name != 'nt':
+            return False
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return False
+        return bool(getattr(st, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+        
+    @staticmethod
+    def _compile_pattern(pattern: str):
+        """
+        编译正则表达式，安装了re2时优先使用不回溯的re2引擎
+        
+        参数:
+            pattern (str): 正则表达式
+            
+        返回:
+            编译后的正则表达式对象
+        """
+        if re2 is not None:
+            try:
+                return re2.compile(pattern)
+            except Exception:
+                # re2不支持反向引用等语法，退回标准库re
+                pass
+        return re.compile(pattern)
+        
+    @staticmethod
+    def _is_path_pattern(pattern: str) -> bool:
+        """
+        检查模式是否包含路径分隔符，需要匹配完整路径
+        
+        参数:
+            pattern (str): 正则表达式
+            
+        返回:
+            bool: 是否需要匹配完整路径
+        """
+        # 正则中的反斜杠分隔符写作 \\，单个反斜杠只是转义符
+        return '/' in pattern or '\\\\' in pattern
+        
     @staticmethod
     def list_directory(directory: str, 
                       recursive: bool = False, 
@@ -354,6 +847,8 @@ class FileUtils:
         """
         列出目录中的所有文件（可选递归）
         
+        不含路径分隔符的模式只匹配文件名，含路径分隔符的模式匹配完整路径。
+        
         参数:
             directory (str): 目录路径
             recursive (bool): 是否递归扫描子目录
@@ -367,34 +862,23 @@ class FileUtils:
         
         try:
             # 编译正则表达式
-            include_regex = re.compile(include_pattern) if include_pattern else None
-            exclude_regex = re.compile(exclude_pattern) if exclude_pattern else None
+            include_regex = FileUtils._compile_pattern(include_pattern) if include_pattern else None
+            exclude_regex = FileUtils._compile_pattern(exclude_pattern) if exclude_pattern else None
+            include_full = include_pattern and FileUtils._is_path_pattern(include_pattern)
+            exclude_full = exclude_pattern and FileUtils._is_path_pattern(exclude_pattern)
             
-            if recursive:
-                # 递归遍历
-                for root, _, files in os.walk(directory):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        
-                        # 检查文件是否匹配模式
-                        if include_regex and not include_regex.search(file_path):
-                            continue
-                        if exclude_regex and exclude_regex.search(file_path):
-                            continue
-                            
-                        result.append(file_path)
-            else:
-                # 非递归，只列出当前目录
-                for item in os.listdir(directory):
-                    file_path = os.path.join(directory, item)
-                    if os.path.isfile(file_path):
-                        # 检查文件是否匹配模式
-                        if include_regex and not include_regex.search(file_path):
-                            continue
-                        if exclude_regex and exclude_regex.search(file_path):
-                            continue
-                            
-                        result.append(file_path)
+            for entry in FileUtils._scandir_recursive(directory, recursive):
+                # 使用DirEntry缓存的类型信息，无需再次stat
+                if not entry.is_file():
+                    continue
+                    
+                # 检查文件是否匹配模式，优先匹配较短的文件名
+                if include_regex and not include_regex.search(entry.path if include_full else entry.name):
+                    continue
+                if exclude_regex and exclude_regex.search(entry.path if exclude_full else entry.name):
+                    continue
+                    
+                result.append(entry.path)
         except Exception as e:
             print(f"列出目录内容失败: {str(e)}")
             
@@ -412,85 +896,107 @@ class FileUtils:
         返回:
             Dict[str, int]: 文件类型及数量的字典
         """
-        result = {}
-        
         try:
-            files = FileUtils.list_directory(directory, recursive)
-            
-            for file_path in files:
-                ext = FileUtils.get_file_extension(file_path)
-                ext = ext.lower() if ext else "无扩展名"
-                
-                if ext in result:
-                    result[ext] += 1
-                else:
-                    result[ext] = 1
+            # 直接使用DirEntry的文件名取扩展名，由Counter在C中完成计数
+            exts = (
+                os.path.splitext(entry.name)[1][1:].lower() or "无扩展名"
+                for entry in FileUtils._scandir_recursive(directory, recursive)
+                if entry.is_file()
+            )
+            return dict(Counter(exts))
         except Exception as e:
             print(f"统计文件类型失败: {str(e)}")
-            
-        return result
+            return {}
         
     @staticmethod
-    def extract_text_from_file(file_path: str, max_size: int = 1024*1024) -> Optional[str]:
+    def extract_text_from_file(file_path: str, max_size: int = 1024*1024,
+                               stat_result: Optional[os.stat_result] = None,
+                               ext: Optional[str] = None) -> Optional[str]:
         """
         从文本文件中提取文本内容
         
         参数:
             file_path (str): 文件路径
             max_size (int): 最大读取大小（字节）
+            stat_result (os.stat_result): 已获取的stat信息，为None时调用一次os.stat
+            ext (str): 已知的文件扩展名(不含点号)，为None时从路径中获取
             
         返回:
             str: 文件内容，读取失败返回None
         """
-        # 常见的文本文件扩展名
-        text_extensions = {
-            'txt', 'log', 'ini', 'cfg', 'conf', 'json', 'xml', 'htm', 'html', 
-            'css', 'js', 'py', 'java', 'c', 'cpp', 'h', 'cs', 'php', 'pl', 
-            'sh', 'bat', 'cmd', 'md', 'csv', 'tsv'
-        }
-        
         try:
+            # 先检查扩展名，不是文本文件时不需要任何系统调用
+            if ext is None:
+                ext = FileUtils.get_file_extension(file_path)
+            if ext not in FileUtils._TEXT_EXTS:
+                # 可能不是文本文件
+                return None
+                
             # 检查文件大小和类型
-            if not os.path.exists(file_path) or not os.path.isfile(file_path):
+            if stat_result is None:
+                try:
+                    stat_result = os.stat(file_path)
+                except (FileNotFoundError, PermissionError, OSError):
+                    return None
+                    
+            if not stat.S_ISREG(stat_result.st_mode):
                 return None
                 
-            file_size = FileUtils.get_file_size(file_path)
-            if file_size == 0 or file_size > max_size:
+            if not 0 < stat_result.st_size <= max_size:
                 return None
                 
-            ext = FileUtils.get_file_extension(file_path)
-            if ext not in text_extensions:
-                # 可能不是文本文件
+            # 只读取一次文件内容，在内存中尝试解码
+            with open(file_path, 'rb') as f:
+                data = f.read()
+                
+            # 依次尝试utf-8和gbk，都失败时才根据文件开头探测编码，最后用latin1兜底
+            text = FileUtils._decode_text(data, ('utf-8', 'gbk'))
+            if text is None:
+                detected = chardet.detect(data[:8192]).get('encoding')
+                encodings = (detected, 'latin1') if detected else ('latin1',)
+                text = FileUtils._decode_text(data, encodings)
+                
+            if text is None:
                 return None
                 
-            # 尝试以不同编码读取文件
-            encodings = ['utf-8', 'gbk', 'latin1']
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        return f.read()
-                except UnicodeDecodeError:
-                    continue
-                    
-            return None
+            # 与文本模式读取一致，统一换行符
+            return text.replace('\r\n', '\n').replace('\r', '\n')
         except Exception as e:
             print(f"从文件提取文本失败: {str(e)}")
             return None
     
+    @staticmethod
+    def _decode_text(data: bytes, encodings) -> Optional[str]:
+        """
+        按顺序尝试用给定编码解码字节数据
+        
+        参数:
+            data (bytes): 字节数据
+            encodings (tuple): 依次尝试的编码
+            
+        返回:
+            str: 解码后的文本，所有编码都失败时返回None
+        """
+        for encoding in encodings:
+            try:
+                return data.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                continue
+        return None
+    
     @staticmethod
     def get_file_creation_time(file_path):
         """
         获取文件创建时间
         
         参数:
-            file_path (str): 文件路径
+            file_path (str | os.stat_result): 文件路径或已获取的stat信息
             
         返回值:
             datetime: 文件创建时间
         """
         try:
-            stat_result = os.stat(file_path)
+            stat_result = FileUtils._as_stat(file_path)
             # 在不同的系统上，创建时间的属性可能不同
             # Windows 使用 st_ctime, Unix使用 st_birthtime （如果可用）
             try:
@@ -508,46 +1014,51 @@ class FileUtils:
         获取文件最后访问时间
         
         参数:
-            file_path (str): 文件路径
+            file_path (str | os.stat_result): 文件路径或已获取的stat信息
             
         返回值:
             datetime: 文件最后访问时间
         """
         try:
-            stat_result = os.stat(file_path)
+            stat_result = FileUtils._as_stat(file_path)
             return datetime.fromtimestamp(stat_result.st_atime)
         except (OSError, FileNotFoundError):
             return None
     
     @staticmethod
-    def calculate_file_hash(file_path, hash_type='md5', buffer_size=8192):
+    def calculate_file_hash(file_path, hash_type='md5', buffer_size=1024*1024):
         """
         计算文件的哈希值
         
         参数:
             file_path (str): 文件路径
             hash_type (str): 哈希算法类型（'md5', 'sha1', 'sha256'）
-            buffer_size (int): 读取文件的缓冲区大小
+            buffer_size (int): 读取文件的缓冲区大小（hashlib.file_digest不可用时使用）
             
         返回值:
             str: 文件的哈希值
         """
         try:
-            if hash_type == 'md5':
-                hash_obj = hashlib.md5()
-            elif hash_type == 'sha1':
-                hash_obj = hashlib.sha1()
-            elif hash_type == 'sha256':
-                hash_obj = hashlib.sha256()
-            else:
-                hash_obj = hashlib.md5()  # 默认使用MD5
-                
+            # 默认使用MD5
+            hash_factory = FileUtils._HASH_FACTORIES.get(hash_type, hashlib.md5)
+            
+            # Python 3.11+ 由hashlib在C中完成读取和哈希计算
+            if hasattr(hashlib, 'file_digest'):
+                with open(file_path, 'rb', buffering=0) as file:
+                    return hashlib.file_digest(file, hash_factory).hexdigest()
+                    
+            hash_obj = hash_factory()
+            
+            # 复用同一个缓冲区读取，避免每次读取都分配新的bytes对象
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            
             with open(file_path, 'rb') as file:
                 while True:
-                    data = file.read(buffer_size)
-                    if not data:
+                    n = file.readinto(buffer)
+                    if not n:
                         break
-                    hash_obj.update(data)
+                    hash_obj.update(view[:n])
                     
             return hash_obj.hexdigest()
         except (OSError, FileNotFoundError):
@@ -584,24 +1095,94 @@ class FileUtils:
             bool: 删除成功返回True，否则返回False
         """
         try:
+            # 与shutil.rmtree一致，拒绝删除指向目录的符号链接和目录联接，避免清空链接目标
+            if os.path.islink(dir_path) or FileUtils._is_junction(dir_path):
+                return False
+                
             if os.path.exists(dir_path) and os.path.isdir(dir_path):
-                # 更改目录权限以便删除
-                for root, dirs, files in os.walk(dir_path, topdown=False):
-                    for file in files:
-                        try:
-                            file_path = os.path.join(root, file)
-                            os.chmod(file_path, stat.S_IWRITE)
-                        except:
-                            pass
-                            
-                shutil.rmtree(dir_path, ignore_errors=True)
+                FileUtils._parallel_rmtree(dir_path)
+                
+                # 并行删除未能删除的内容，再用rmtree处理一次
+                if os.path.exists(dir_path):
+                    shutil.rmtree(dir_path, ignore_errors=True)
                 return not os.path.exists(dir_path)
             return False
         except Exception:
             return False
     
     @staticmethod
-    def list_files(directory, recursive=True, include_dirs=False, filter_func=None):
+    def _parallel_rmtree(root, workers=16, batch_size=1024):
+        """
+        使用线程池并行删除目录树中的文件，再自底向上删除目录
+        
+        参数:
+            root (str): 目录路径
+            workers (int): 删除文件的线程数
+            batch_size (int): 每个任务删除的文件数
+        """
+        def unlink_batch(paths):
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except PermissionError:
+                    # 只读文件（Windows）需要先更改权限；先尝试删除，避免对符号链接的目标执行chmod
+                    try:
+                        os.chmod(path, stat.S_IWRITE)
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                except OSError:
+                    pass
+                    
+        # 遍历时父目录总是排在子目录之前
+        dirs = []
+        batch = []
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for entry in FileUtils._scandir_recursive(root):
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                    
+                if is_dir and FileUtils._is_junction_entry(entry):
+                    # 目录联接只删除联接本身，遍历时也不会进入其目标
+                    try:
+                        os.rmdir(entry.path)
+                    except OSError:
+                        try:
+                            os.unlink(entry.path)
+                        except OSError:
+                            pass
+                    continue
+                    
+                if is_dir:
+                    dirs.append(entry.path)
+                    continue
+                    
+                # 文件和符号链接都直接删除
+                batch.append(entry.path)
+                if len(batch) >= batch_size:
+                    executor.submit(unlink_batch, batch)
+                    batch = []
+                    
+            if batch:
+                executor.submit(unlink_batch, batch)
+                
+        # 所有文件删除后，从最深的目录开始删除
+        for path in reversed(dirs):
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+                
+        try:
+            os.rmdir(root)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def list_files(directory, recursive=True, include_dirs=False, filter_func=None, entry_filter=None):
         """
         列出目录中的所有文件
         
@@ -610,6 +1191,7 @@ class FileUtils:
             recursive (bool): 是否递归搜索子目录
             include_dirs (bool): 是否包含目录在结果中
             filter_func (callable): 过滤函数，接受文件路径作为参数，返回True则包含该文件
+            entry_filter (callable): 过滤函数，接受os.DirEntry作为参数，可直接使用其缓存的stat信息
             
         返回值:
             list: 文件路径列表
@@ -617,30 +1199,17 @@ class FileUtils:
         files = []
         
         try:
-            if not os.path.exists(directory) or not os.path.isdir(directory):
+            if not os.path.isdir(directory):
                 return files
                 
-            if recursive:
-                for root, dirs, filenames in os.walk(directory):
-                    # 如果包含目录
-                    if include_dirs:
-                        for dir_name in dirs:
-                            dir_path = os.path.join(root, dir_name)
-                            if filter_func is None or filter_func(dir_path):
-                                files.append(dir_path)
+            for entry in FileUtils._scandir_recursive(directory, recursive):
+                if not include_dirs and entry.is_dir():
+                    continue
                     
-                    # 添加文件
-                    for filename in filenames:
-                        file_path = os.path.join(root, filename)
-                        if filter_func is None or filter_func(file_path):
-                            files.append(file_path)
-            else:
-                # 非递归模式
-                with os.scandir(directory) as entries:
-                    for entry in entries:
-                        if include_dirs or not entry.is_dir():
-                            if filter_func is None or filter_func(entry.path):
-                                files.append(entry.path)
+                if entry_filter is not None and not entry_filter(entry):
+                    continue
+                if filter_func is None or filter_func(entry.path):
+                    files.append(entry.path)
         except Exception:
             pass
             
@@ -660,23 +1229,20 @@ class FileUtils:
         返回值:
             list: 文件路径列表
         """
-        now = datetime.now()
-        seconds = days * 24 * 3600  # 转换为秒
+        # 只计算一次截止时间，过滤时直接比较时间戳，不创建datetime对象
+        cutoff_ts = time.time() - days * 24 * 3600
         
-        def age_filter(file_path):
+        def age_filter(entry):
             try:
-                mtime = FileUtils.get_file_modified_time(file_path)
-                if mtime:
-                    age = (now - mtime).total_seconds()
-                    if older_than:
-                        return age > seconds
-                    else:
-                        return age <= seconds
-                return False
-            except:
+                # DirEntry.stat()会缓存结果，不重复调用系统接口
+                mtime = entry.stat().st_mtime
+            except OSError:
                 return False
+            if older_than:
+                return mtime < cutoff_ts
+            return mtime >= cutoff_ts
                 
-        return FileUtils.list_files(directory, recursive=recursive, filter_func=age_filter)
+        return FileUtils.list_files(directory, recursive=recursive, entry_filter=age_filter)
     
     @staticmethod
     def find_large_files(directory, min_size_mb, recursive=True):
@@ -693,13 +1259,13 @@ class FileUtils:
         """
         min_size_bytes = min_size_mb * 1024 * 1024  # 转换为字节
         
-        def size_filter(file_path):
+        def size_filter(entry):
             try:
-                return os.path.isfile(file_path) and os.path.getsize(file_path) >= min_size_bytes
+                return entry.is_file() and FileUtils.get_file_size(entry.stat()) >= min_size_bytes
             except:
                 return False
                 
-        return FileUtils.list_files(directory, recursive=recursive, filter_func=size_filter)
+        return FileUtils.list_files(directory, recursive=recursive, entry_filter=size_filter)
     
     @staticmethod
     def find_empty_directories(directory, recursive=True):
@@ -720,13 +1286,7 @@ class FileUtils:
                 return empty_dirs
                 
             if recursive:
-                for root, dirs, files in os.walk(directory, topdown=False):
-                    # 检查当前目录是否为空
-                    if not dirs and not files:
-                        empty_dirs.append(root)
-                    # 或者所有子目录都是空目录
-                    elif not files and all(os.path.join(root, d) in empty_dirs for d in dirs):
-                        empty_dirs.append(root)
+                FileUtils._collect_empty_dirs(directory, empty_dirs)
             else:
                 # 非递归模式只检查顶层目录
                 if not os.listdir(directory):
@@ -736,6 +1296,55 @@ class FileUtils:
             
         return empty_dirs
     
+    @staticmethod
+    def _hash_prefix(file_path, size=65536):
+        """
+        计算文件开头部分的哈希值，用于快速排除不同的文件
+        
+        参数:
+            file_path (str): 文件路径
+            size (int): 读取的字节数
+            
+        返回值:
+            str: 文件开头部分的哈希值，读取失败返回None
+        """
+        try:
+            with open(file_path, 'rb') as file:
+                return hashlib.blake2b(file.read(size), digest_size=16).hexdigest()
+        except (OSError, FileNotFoundError):
+            return None
+    
+    @staticmethod
+    def _collect_empty_dirs(path, out):
+        """
+        后序遍历目录，收集不包含任何文件的目录
+        
+        参数:
+            path (str): 目录路径
+            out (list): 收集空目录的列表，子目录排在父目录之前
+            
+        返回值:
+            bool: 该目录是否为空（只包含空目录）
+        """
+        has_content = False
+        
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # 需要遍历所有子目录，才能收集到全部空目录
+                        if not FileUtils._collect_empty_dirs(entry.path, out):
+                            has_content = True
+                    else:
+                        has_content = True
+        except OSError:
+            # 无法访问的目录不视为空目录
+            return False
+            
+        if not has_content:
+            out.append(path)
+        return not has_content
+    
     @staticmethod
     def find_duplicate_files(directories, recursive=True):
         """
@@ -751,35 +1360,55 @@ class FileUtils:
         if isinstance(directories, str):
             directories = [directories]
             
-        # 第一步：按大小分组
+        prefix_size = 65536
+        
+        # 第一步：按大小分组，大小直接取自DirEntry的stat信息
         size_groups = {}
         
         for directory in directories:
-            for file_path in FileUtils.list_files(directory, recursive=recursive):
-                if os.path.isfile(file_path):
-                    try:
-                        size = os.path.getsize(file_path)
-                        if size not in size_groups:
-                            size_groups[size] = []
-                        size_groups[size].append(file_path)
-                    except:
-                        pass
+            for entry in FileUtils._scandir_recursive(directory, recursive):
+                try:
+                    if entry.is_file():
+                        size_groups.setdefault(entry.stat().st_size, []).append(entry.path)
+                except OSError:
+                    pass
         
-        # 第二步：计算相同大小文件的哈希值
-        hash_groups = {}
+        # 第二步：大文件先比较开头部分的哈希值，只有开头相同的文件才需要计算完整哈希值
+        candidates = []
         
         for size, files in size_groups.items():
             if len(files) < 2:  # 跳过唯一大小的文件
                 continue
                 
+            if size <= prefix_size:
+                candidates.extend(files)
+                continue
+                
+            prefix_groups = {}
             for file_path in files:
-                file_hash = FileUtils.calculate_file_hash(file_path)
-                if file_hash:
-                    if file_hash not in hash_groups:
-                        hash_groups[file_hash] = []
-                    hash_groups[file_hash].append(file_path)
+                prefix_hash = FileUtils._hash_prefix(file_path, prefix_size)
+                if prefix_hash:
+                    prefix_groups.setdefault(prefix_hash, []).append(file_path)
+                    
+            for group in prefix_groups.values():
+                if len(group) > 1:
+                    candidates.extend(group)
+        
+        # 第三步：并行计算候选文件的完整哈希值（读取和哈希计算时会释放GIL）
+        hash_groups = {}
+        
+        if not candidates:
+            return {}
+            
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            hashes = list(executor.map(FileUtils.calculate_file_hash, candidates))
+            
+        for file_path, file_hash in zip(candidates, hashes):
+            if file_hash:
+                hash_groups.setdefault(file_hash, []).append(file_path)
         
-        # 第三步：过滤出只有重复文件的组
+        # 第四步：过滤出只有重复文件的组
         duplicates = {h: files for h, files in hash_groups.items() if len(files) > 1}
         
         return duplicates
@@ -805,17 +1434,41 @@ class FileUtils:
                 with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
                     for file in files:
                         if os.path.isfile(file):
-                            zipf.write(file, os.path.basename(file))
+                            zipf.write(file, os.path.basename(file),
+                                       compress_type=FileUtils._zip_compress_type(file))
                         elif os.path.isdir(file):
                             for root, _, filenames in os.walk(file):
                                 for filename in filenames:
                                     file_path = os.path.join(root, filename)
                                     arcname = os.path.relpath(file_path, os.path.dirname(file))
-                                    zipf.write(file_path, arcname)
+                                    zipf.write(file_path, arcname,
+                                               compress_type=FileUtils._zip_compress_type(filename))
             elif format.lower() == 'tar':
-                with tarfile.open(output_path, 'w:gz') as tar:
-                    for file in files:
-                        tar.add(file, arcname=os.path.basename(file))
+                compressor = FileUtils._find_parallel_compressor(output_path)
+                
+                if compressor:
+                    # 由外部多线程压缩程序压缩tar数据流
+                    with open(output_path, 'wb') as output:
+                        process = subprocess.Popen(compressor, stdin=subprocess.PIPE, stdout=output)
+                        try:
+                            with tarfile.open(fileobj=process.stdin, mode='w|',
+                                              bufsize=FileUtils._TAR_BUFFER_SIZE) as tar:
+                                tar.copybufsize = FileUtils._TAR_BUFFER_SIZE
+                                for file in files:
+                                    tar.add(file, arcname=os.path.basename(file))
+                        finally:
+                            process.stdin.close()
+                            return_code = process.wait()
+                            
+                    if return_code != 0:
+                        logging.error(f"压缩程序 {compressor[0]} 退出码: {return_code}")
+                        return False
+                else:
+                    with tarfile.open(output_path, 'w:gz') as tar:
+                        # 增大复制文件内容时的缓冲区（默认16KB）
+                        tar.copybufsize = FileUtils._TAR_BUFFER_SIZE
+                        for file in files:
+                            tar.add(file, arcname=os.path.basename(file))
             else:
                 logging.error(f"不支持的压缩格式: {format}")
                 return False
@@ -825,6 +1478,40 @@ class FileUtils:
             logging.error(f"压缩文件失败: {e}")
             return False
     
+    @staticmethod
+    def _zip_compress_type(file_name):
+        """
+        根据扩展名选择ZIP压缩方式，已压缩的格式直接存储
+        
+        参数:
+            file_name (str): 文件名或路径
+            
+        返回值:
+            int: zipfile.ZIP_STORED 或 zipfile.ZIP_DEFLATED
+        """
+        ext = os.path.splitext(file_name)[1][1:].lower()
+        return zipfile.ZIP_STORED if ext in FileUtils._INCOMPRESSIBLE else zipfile.ZIP_DEFLATED
+    
+    @staticmethod
+    def _find_parallel_compressor(output_path):
+        """
+        查找可用的多线程压缩程序
+        
+        .zst/.tzst输出优先使用zstd，其他情况使用与gzip格式兼容的pigz。
+        
+        参数:
+            output_path (str): 输出压缩文件的路径
+            
+        返回值:
+            list: 压缩命令，没有可用程序时返回None
+        """
+        if output_path.lower().endswith(('.zst', '.tzst')):
+            if shutil.which('zstd'):
+                return ['zstd', '-T0', '-q', '-c']
+        elif shutil.which('pigz'):
+            return ['pigz', '-c']
+        return None
+    
     @staticmethod
     def extract_archive(archive_path, extract_to=None, password=None):
         """
@@ -848,13 +1535,23 @@ class FileUtils:
             file_ext = os.path.splitext(archive_path)[1].lower()
             
             if file_ext == '.zip':
-                with zipfile.ZipFile(archive_path, 'r') as zipf:
-                    if password:
-                        zipf.setpassword(password.encode())
-                    zipf.extractall(extract_to)
+                FileUtils._extract_zip(archive_path, extract_to, password)
             elif file_ext in ['.tar', '.gz', '.bz2', '.xz']:
-                with tarfile.open(archive_path, 'r:*') as tar:
-                    tar.extractall(path=extract_to)
+                # 使用大缓冲区读取归档文件，减少短读取的次数
+                with io.BufferedReader(open(archive_path, 'rb', buffering=0),
+                                       buffer_size=FileUtils._READ_BUFFER_SIZE) as raw:
+                    decompressor = FileUtils._DECOMPRESSORS.get(file_ext)
+                    if decompressor is None:
+                        with tarfile.open(fileobj=raw, mode='r:*') as tar:
+                            tar.copybufsize = FileUtils._TAR_BUFFER_SIZE
+                            tar.extractall(path=extract_to)
+                    else:
+                        # 解压缩后的数据流再包一层大缓冲区，tar按流式模式顺序读取
+                        with decompressor(raw, 'rb') as stream, \
+                                io.BufferedReader(stream, buffer_size=FileUtils._READ_BUFFER_SIZE) as buf, \
+                                tarfile.open(fileobj=buf, mode='r|') as tar:
+                            tar.copybufsize = FileUtils._TAR_BUFFER_SIZE
+                            tar.extractall(path=extract_to)
             else:
                 logging.error(f"不支持的归档格式: {file_ext}")
                 return False
@@ -864,6 +1561,36 @@ class FileUtils:
             logging.error(f"解压缩归档文件失败: {e}")
             return False
     
+    @staticmethod
+    def _extract_zip(archive_path, extract_to, password=None):
+        """
+        逐个条目流式解压ZIP文件
+        
+        参数:
+            archive_path (str): ZIP文件路径
+            extract_to (str): 解压缩目标目录
+            password (str): ZIP文件密码
+        """
+        root = os.path.abspath(extract_to)
+        pwd = password.encode() if password else None
+        
+        with zipfile.ZipFile(archive_path, 'r') as zipf:
+            for info in zipf.infolist():
+                target = os.path.abspath(os.path.join(root, info.filename))
+                
+                # 防止条目路径跳出目标目录（Zip Slip）
+                if os.path.commonpath([root, target]) != root:
+                    logging.warning(f"跳过不安全的归档路径: {info.filename}")
+                    continue
+                    
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                    
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zipf.open(info, pwd=pwd) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+    
     @staticmethod
     def get_folder_size(folder_path):
         """
@@ -935,61 +1662,143 @@ class FileUtils:
             return False
     
     @staticmethod
-    def check_file_health(file_path):
+    def check_file_health(file_path, deep=False):
         """
         检查文件是否损坏
         
         参数:
             file_path (str): 文件路径
+            deep (bool): 是否对图片做深度检查（使用PIL完整解析），默认只检查文件头魔数
             
         返回值:
             bool: 文件健康返回True，损坏返回False
         """
         try:
-            # 检查文件是否存在
-            if not os.path.exists(file_path):
+            # 只需要文件头的前16字节，不使用缓冲区
+            try:
+                with open(file_path, 'rb', buffering=0) as f:
+                    data = f.read(16)
+            except OSError:
+                # 文件不存在或无法读取
                 return False
                 
             # 检查文件是否为空
-            if os.path.getsize(file_path) == 0:
+            if not data:
                 return False
                 
-            # 尝试打开并读取文件的前1KB
-            with open(file_path, 'rb') as f:
-                data = f.read(1024)
-                
             # 针对不同类型的文件做特定检查
             file_ext = os.path.splitext(file_path)[1].lower()
+            checker = FileUtils._HEALTH_CHECKERS.get(file_ext)
             
-            # 检查ZIP文件
-            if file_ext == '.zip':
-                try:
-                    with zipfile.ZipFile(file_path, 'r') as zipf:
-                        zipf.testzip()  # 测试zip文件完整性
-                    return True
-                except:
-                    return False
+            # 默认情况下，如果我们能读取文件，则认为它没有损坏
+            if checker is None:
+                return True
+                
+            return getattr(FileUtils, checker)(file_path, file_ext, data, deep)
             
-            # 检查图片文件
-            elif file_ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
-                try:
-                    from PIL import Image
-                    Image.open(file_path).verify()
-                    return True
-                except:
-                    return False
+        except Exception as e:
+            logging.error(f"检查文件健康状态失败: {e}")
+            return False
             
-            # 检查PDF文件
-            elif file_ext == '.pdf':
-                if data.startswith(b'%PDF'):
-                    return True
-                return False
+    @staticmethod
+    def check_health_batch(file_paths, deep=False, max_in_flight=256):
+        """
+        批量检查文件是否损坏，在线程池中并发读取文件头，保持多个读取请求同时进行
+        
+        参数:
+            file_paths (list): 文件路径列表
+            deep (bool): 是否对图片做深度检查
+            max_in_flight (int): 同时进行的最大检查数量
             
-            # 默认情况下，如果我们能读取文件，则认为它没有损坏
+        返回值:
+            list: (文件路径, 是否健康) 元组列表，顺序与输入相同
+        """
+        results = []
+        pending = deque()
+        
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for file_path in file_paths:
+                # 达到上限时先取回最早提交的结果，避免一次提交所有任务
+                if len(pending) >= max_in_flight:
+                    path, future = pending.popleft()
+                    results.append((path, future.result()))
+                    
+                pending.append((file_path, executor.submit(FileUtils.check_file_health, file_path, deep)))
+                
+            while pending:
+                path, future = pending.popleft()
+                results.append((path, future.result()))
+                
+        return results
+        
+    @staticmethod
+    def _check_magic_health(file_path, file_ext, data, deep):
+        """
+        通过文件头魔数检查文件
+        
+        参数:
+            file_path (str): 文件路径
+            file_ext (str): 小写的文件扩展名（含点号）
+            data (bytes): 已读取的文件头
+            deep (bool): 是否深度检查
+            
+        返回值:
+            bool: 文件健康返回True，损坏返回False
+        """
+        return data.startswith(FileUtils._MAGICS[file_ext])
+        
+    @staticmethod
+    def _check_image_health(file_path, file_ext, data, deep):
+        """
+        检查图片文件，先检查文件头魔数，深度检查时再使用PIL完整解析
+        
+        参数:
+            file_path (str): 文件路径
+            file_ext (str): 小写的文件扩展名（含点号）
+            data (bytes): 已读取的文件头
+            deep (bool): 是否深度检查
+            
+        返回值:
+            bool: 文件健康返回True，损坏返回False
+        """
+        if not FileUtils._check_magic_health(file_path, file_ext, data, deep):
+            return False
+            
+        if not deep:
             return True
             
-        except Exception as e:
-            logging.error(f"检查文件健康状态失败: {e}")
+        try:
+            from PIL import Image
+        except ImportError:
+            return True
+            
+        try:
+            with Image.open(file_path) as img:
+                img.verify()
+            return True
+        except Exception:
+            return False
+            
+    @staticmethod
+    def _check_zip_health(file_path, file_ext, data, deep):
+        """
+        检查ZIP文件中所有条目的CRC
+        
+        参数:
+            file_path (str): 文件路径
+            file_ext (str): 小写的文件扩展名（含点号）
+            data (bytes): 已读取的文件头
+            deep (bool): 是否深度检查
+            
+        返回值:
+            bool: 文件健康返回True，损坏返回False
+        """
+        try:
+            with zipfile.ZipFile(file_path, 'r') as zipf:
+                # testzip返回第一个损坏条目的名称，全部正常时返回None
+                return zipf.testzip() is None
+        except Exception:
             return False
             
     @staticmethod
@@ -1007,8 +1816,8 @@ class FileUtils:
             return "0 B"
             
         size_names = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
+        # 用二进制位数计算单位，避免浮点对数在1024的整数次幂附近出现误差
+        i = max(0, min((int(size_bytes).bit_length() - 1) // 10, len(size_names) - 1))
+        s = round(size_bytes / (1 << (10 * i)), 2)
         
         return f"{s} {size_names[i]}" 
\ No newline at end of file
@@ -2,9 +2,40 @@
 路径工具模块，提供路径处理相关的功能
 """
 import os
-import sys
-from pathlib import Path
+import functools
 from utils.system_utils import SystemUtils
+from utils import _env
+
+# (系统类型, 目录类型) -> (基础目录, 应用目录下的子目录)
+_APP_DIR_TABLE = {
+    # Windows: %APPDATA%/AppName
+    ('windows', 'data'): (_env.APPDATA, ()),
+    # Windows: %LOCALAPPDATA%/AppName
+    ('windows', 'config'): (_env.LOCALAPPDATA, ()),
+    # Windows: %LOCALAPPDATA%/AppName/Cache
+    ('windows', 'cache'): (_env.LOCALAPPDATA, ('Cache',)),
+    # Windows: %LOCALAPPDATA%/AppName/Logs
+    ('windows', 'logs'): (_env.LOCALAPPDATA, ('Logs',)),
+    # MacOS: ~/Library/Application Support/AppName
+    ('darwin', 'data'): (os.path.join(_env.HOME, 'Library', 'Application Support'), ()),
+    # MacOS: ~/Library/Preferences/AppName
+    ('darwin', 'config'): (os.path.join(_env.HOME, 'Library', 'Preferences'), ()),
+    # MacOS: ~/Library/Caches/AppName
+    ('darwin', 'cache'): (os.path.join(_env.HOME, 'Library', 'Caches'), ()),
+    # MacOS: ~/Library/Logs/AppName
+    ('darwin', 'logs'): (os.path.join(_env.HOME, 'Library', 'Logs'), ()),
+    # Linux: ~/.local/share/AppName
+    ('linux', 'data'): (os.path.join(_env.HOME, '.local', 'share'), ()),
+    # Linux: ~/.config/AppName
+    ('linux', 'config'): (os.path.join(_env.HOME, '.config'), ()),
+    # Linux: ~/.cache/AppName
+    ('linux', 'cache'): (os.path.join(_env.HOME, '.cache'), ()),
+    # Linux: ~/.local/share/AppName/logs
+    ('linux', 'logs'): (os.path.join(_env.HOME, '.local', 'share'), ('logs',)),
+}
+
+# 已确认存在的目录
+_ENSURED = set()
 
 class PathUtils:
     """路径工具类，提供路径处理的方法"""
@@ -20,9 +51,20 @@ class PathUtils:
         返回值:
             str: 规范化后的路径
         """
-        if path:
-            return os.path.normpath(os.path.expanduser(str(path)))
-        return path
+        if not path:
+            return path
+            
+        path = path if type(path) is str else str(path)
+        
+        # 绝大多数路径不以~开头，不需要调用expanduser
+        if path[:1] == '~':
+            if len(path) == 1 or path[1] == os.sep or path[1] == os.altsep:
+                path = _env.HOME + path[1:]
+            else:
+                # ~user形式交给expanduser处理
+                path = os.path.expanduser(path)
+                
+        return os.path.normpath(path)
     
     @staticmethod
     def get_user_home_dir():
@@ -32,40 +74,68 @@ class PathUtils:
         返回值:
             str: 用户主目录路径
         """
-        return os.path.expanduser('~')
+        return _env.HOME
     
     @staticmethod
-    def get_app_data_dir(app_name='PCGarbageCleaner'):
+    def _get_app_dir(kind, app_name):
         """
-        获取应用程序数据目录
+        根据系统类型和目录类型获取应用程序目录，并确保目录存在
         
         参数:
+            kind (str): 目录类型，'data'、'config'、'cache'、'logs' 中的一个
             app_name (str): 应用程序名称
             
         返回值:
-            str: 应用程序数据目录路径
+            str: 应用程序目录路径
         """
         system = SystemUtils.get_system_type()
-        
-        if system == 'windows':
-            # Windows: %APPDATA%/AppName
-            base_dir = os.environ.get('APPDATA', '')
-            if not base_dir:
-                base_dir = os.path.join(os.path.expanduser('~'), 'AppData', 'Roaming')
-        elif system == 'darwin':
-            # MacOS: ~/Library/Application Support/AppName
-            base_dir = os.path.join(os.path.expanduser('~'), 'Library', 'Application Support')
-        else:
-            # Linux: ~/.local/share/AppName
-            base_dir = os.path.join(os.path.expanduser('~'), '.local', 'share')
+        if system not in ('windows', 'darwin'):
+            system = 'linux'
             
-        app_dir = os.path.join(base_dir, app_name)
+        base_dir, sub_parts = _APP_DIR_TABLE[(system, kind)]
+        app_dir = os.path.join(base_dir, app_name, *sub_parts)
         
         # 确保目录存在
-        os.makedirs(app_dir, exist_ok=True)
-        
+        PathUtils._ensure_dir(app_dir)
+            
         return app_dir
     
+    @staticmethod
+    def _ensure_dir(path):
+        """
+        确保目录存在，已确认过的目录不再重复检查
+        
+        先直接尝试创建目录（父目录存在时只需一次系统调用），父目录不存在时才逐级创建
+        
+        参数:
+            path (str): 目录路径
+        """
+        if path in _ENSURED:
+            return
+            
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            if not os.path.isdir(path):
+                raise
+        except FileNotFoundError:
+            os.makedirs(path, exist_ok=True)
+            
+        _ENSURED.add(path)
+    
+    @staticmethod
+    def get_app_data_dir(app_name='PCGarbageCleaner'):
+        """
+        获取应用程序数据目录
+        
+        参数:
+            app_name (str): 应用程序名称
+            
+        返回值:
+            str: 应用程序数据目录路径
+        """
+        return PathUtils._get_app_dir('data', app_name)
+    
     @staticmethod
     def get_app_config_dir(app_name='PCGarbageCleaner'):
         """
@@ -77,26 +147,7 @@ class PathUtils:
         返回值:
             str: 应用程序配置目录路径
         """
-        system = SystemUtils.get_system_type()
-        
-        if system == 'windows':
-            # Windows: %LOCALAPPDATA%/AppName
-            base_dir = os.environ.get('LOCALAPPDATA', '')
-            if not base_dir:
-                base_dir = os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
-        elif system == 'darwin':
-            # MacOS: ~/Library/Preferences/AppName
-            base_dir = os.path.join(os.path.expanduser('~'), 'Library', 'Preferences')
-        else:
-            # Linux: ~/.config/AppName
-            base_dir = os.path.join(os.path.expanduser('~'), '.config')
-            
-        config_dir = os.path.join(base_dir, app_name)
-        
-        # 确保目录存在
-        os.makedirs(config_dir, exist_ok=True)
-        
-        return config_dir
+        return PathUtils._get_app_dir('config', app_name)
     
     @staticmethod
     def get_app_cache_dir(app_name='PCGarbageCleaner'):
@@ -109,27 +160,7 @@ class PathUtils:
         返回值:
             str: 应用程序缓存目录路径
         """
-        system = SystemUtils.get_system_type()
-        
-        if system == 'windows':
-            # Windows: %LOCALAPPDATA%/AppName/Cache
-            base_dir = os.environ.get('LOCALAPPDATA', '')
-            if not base_dir:
-                base_dir = os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
-            cache_dir = os.path.join(base_dir, app_name, 'Cache')
-        elif system == 'darwin':
-            # MacOS: ~/Library/Caches/AppName
-            base_dir = os.path.join(os.path.expanduser('~'), 'Library', 'Caches')
-            cache_dir = os.path.join(base_dir, app_name)
-        else:
-            # Linux: ~/.cache/AppName
-            base_dir = os.path.join(os.path.expanduser('~'), '.cache')
-            cache_dir = os.path.join(base_dir, app_name)
-            
-        # 确保目录存在
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        return cache_dir
+        return PathUtils._get_app_dir('cache', app_name)
     
     @staticmethod
     def get_app_logs_dir(app_name='PCGarbageCleaner'):
@@ -142,27 +173,7 @@ class PathUtils:
         返回值:
             str: 应用程序日志目录路径
         """
-        system = SystemUtils.get_system_type()
-        
-        if system == 'windows':
-            # Windows: %LOCALAPPDATA%/AppName/Logs
-            base_dir = os.environ.get('LOCALAPPDATA', '')
-            if not base_dir:
-                base_dir = os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
-            logs_dir = os.path.join(base_dir, app_name, 'Logs')
-        elif system == 'darwin':
-            # MacOS: ~/Library/Logs/AppName
-            base_dir = os.path.join(os.path.expanduser('~'), 'Library', 'Logs')
-            logs_dir = os.path.join(base_dir, app_name)
-        else:
-            # Linux: ~/.local/share/AppName/logs
-            base_dir = os.path.join(os.path.expanduser('~'), '.local', 'share', app_name)
-            logs_dir = os.path.join(base_dir, 'logs')
-            
-        # 确保目录存在
-        os.makedirs(logs_dir, exist_ok=True)
-        
-        return logs_dir
+        return PathUtils._get_app_dir('logs', app_name)
         
     @staticmethod
     def get_relative_path(path, base_path):
@@ -182,25 +193,26 @@ class PathUtils:
             return path
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_common_system_dirs():
         """
-        获取常见的系统目录列表
+        获取常见的系统目录列表，结果在首次调用后缓存
         
         返回值:
-            list: 系统目录路径列表
+            tuple: 系统目录路径元组
         """
         system_dirs = []
         system = SystemUtils.get_system_type()
         
         if system == 'windows':
             # Windows系统目录
-            windows_dir = os.environ.get('WINDIR', 'C:\\Windows')
+            windows_dir = _env.WINDIR
             system_dirs.extend([
                 windows_dir,
                 os.path.join(windows_dir, 'System32'),
                 os.path.join(windows_dir, 'SysWOW64'),
-                os.environ.get('PROGRAMFILES', 'C:\\Program Files'),
-                os.environ.get('PROGRAMFILES(X86)', 'C:\\Program Files (x86)')
+                _env.PROGRAMFILES,
+                _env.PROGRAMFILES_X86
             ])
         elif system == 'darwin':
             # MacOS系统目录
@@ -225,7 +237,27 @@ class PathUtils:
                 '/opt'
             ])
             
-        return [d for d in system_dirs if os.path.exists(d)]
+        return tuple(SystemUtils.filter_existing_dirs(system_dirs))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _get_system_dir_prefixes():
+        """
+        获取规范化后以路径分隔符结尾的系统目录前缀，按长度从长到短排序
+        
+        返回值:
+            tuple: 系统目录前缀元组
+        """
+        prefixes = set()
+        for sys_dir in PathUtils.get_common_system_dirs():
+            # 与被检查的路径使用相同的规范化方式，环境变量中的目录可能带有多余的分隔符
+            prefix = os.path.normcase(os.path.normpath(sys_dir))
+            # 根目录（如 "C:\\" 或 "/"）规范化后已经以分隔符结尾
+            if not prefix.endswith(os.sep):
+                prefix += os.sep
+            prefixes.add(prefix)
+            
+        return tuple(sorted(prefixes, key=len, reverse=True))
     
     @staticmethod
     def is_system_directory(path):
@@ -238,15 +270,10 @@ class PathUtils:
         返回值:
             bool: 是系统目录则返回True，否则返回False
         """
-        # 规范化路径
-        path = PathUtils.normalize_path(path)
+        # 规范化路径，末尾加上分隔符后系统目录本身也能按前缀匹配
+        path = os.path.normcase(PathUtils.normalize_path(path))
+        if not path.endswith(os.sep):
+            path += os.sep
         
-        # 获取系统目录列表
-        system_dirs = PathUtils.get_common_system_dirs()
-        
-        # 检查路径是否是系统目录或其子目录
-        for sys_dir in system_dirs:
-            if path == sys_dir or path.startswith(sys_dir + os.sep):
-                return True
-                
-        return False 
\ No newline at end of file
+        # 检查路径是否是系统目录或其子目录，str.startswith一次比较所有前缀
+        return path.startswith(PathUtils._get_system_dir_prefixes()) 
\ No newline at end of file
@@ -1,8 +1,39 @@
 """
 文件大小转换和计算工具
 """
+import re
+import bisect
 from typing import Tuple, List, Union, Dict
 
+# 匹配数字和可选单位的大小字符串，如 "1.5 MB"
+_SIZE_RE = re.compile(r"([\d.]+)\s*([A-Za-z]*)")
+
+# 单位到字节数的映射
+_UNITS = {
+    "B": 1,
+    "BYTE": 1,
+    "BYTES": 1,
+    "K": 1024,
+    "KB": 1024,
+    "KIB": 1024,
+    "M": 1024 ** 2,
+    "MB": 1024 ** 2,
+    "MIB": 1024 ** 2,
+    "G": 1024 ** 3,
+    "GB": 1024 ** 3,
+    "GIB": 1024 ** 3,
+    "T": 1024 ** 4,
+    "TB": 1024 ** 4,
+    "TIB": 1024 ** 4
+}
+
+# 可读大小的单位，下标为以1024为底的指数
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# 大小分类的下限（字节），与_CAT_LABELS一起通过二分查找得到分类
+_CAT_THRESHOLDS = (1, 10 * 1024, 1024 ** 2, 100 * 1024 ** 2, 1024 ** 3)
+_CAT_LABELS = ("空", "极小", "小", "中等", "大", "极大")
+
 
 class SizeUtils:
     """处理文件大小的工具类"""
@@ -32,24 +63,58 @@ class SizeUtils:
         if size_in_bytes == 0:
             return "0 B"
             
-        units = ["B", "KB", "MB", "GB", "TB", "PB"]
-        unit_index = 0
-        size = float(size_in_bytes)
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
+        # 用二进制位数直接得到单位，不需要逐级除以1024
+        unit_index = max(0, min((int(size_in_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1))
+        size = size_in_bytes / (1 << (10 * unit_index))
             
         # 格式化小数位数
         if unit_index == 0:  # 如果是字节，不显示小数
-            return f"{int(size)} {units[unit_index]}"
+            return f"{int(size)} {_SIZE_UNITS[unit_index]}"
         else:
-            format_str = f"{{:.{decimal_places}f}} {{}}".format(size, units[unit_index])
-            result = format_str.format(size, units[unit_index])
+            num = f"{size:.{decimal_places}f}"
             # 去掉末尾的0
-            if "." in result:
-                result = result.rstrip("0").rstrip(".") + " " + units[unit_index]
-            return result
+            if "." in num:
+                num = num.rstrip("0").rstrip(".")
+            return f"{num} {_SIZE_UNITS[unit_index]}"
+            
+    @staticmethod
+    def bytes_to_human_readable_batch(sizes: List[int], decimal_places: int = 2) -> List[str]:
+        """
+        批量将字节大小转换为人类可读的格式，结果与逐个调用bytes_to_human_readable相同
+        
+        适合一次格式化大量大小（如扫描结果列表），格式和单位表只在循环外准备一次
+        
+        参数:
+            sizes (List[int]): 字节大小列表
+            decimal_places (int): 小数位数
+            
+        返回:
+            List[str]: 格式化后的大小字符串列表
+        """
+        last_index = len(_SIZE_UNITS) - 1
+        spec = f".{decimal_places}f"
+        result = []
+        append = result.append
+        
+        for size in sizes:
+            if size < 0:
+                append("未知大小")
+                continue
+                
+            unit_index = (int(size).bit_length() - 1) // 10
+            if unit_index <= 0:
+                # 字节不显示小数
+                append(f"{int(size)} B")
+                continue
+            if unit_index > last_index:
+                unit_index = last_index
+                
+            num = format(size / (1 << (10 * unit_index)), spec)
+            if "." in num:
+                num = num.rstrip("0").rstrip(".")
+            append(f"{num} {_SIZE_UNITS[unit_index]}")
+            
+        return result
             
     @staticmethod
     def human_readable_to_bytes(size_str: str) -> int:
@@ -69,37 +134,17 @@ class SizeUtils:
         if not size_str:
             return 0
             
-        # 定义单位映射
-        units = {
-            "B": SizeUtils.BYTE,
-            "BYTE": SizeUtils.BYTE,
-            "BYTES": SizeUtils.BYTE,
-            "K": SizeUtils.KB,
-            "KB": SizeUtils.KB,
-            "KIB": SizeUtils.KB,
-            "M": SizeUtils.MB,
-            "MB": SizeUtils.MB,
-            "MIB": SizeUtils.MB,
-            "G": SizeUtils.GB,
-            "GB": SizeUtils.GB,
-            "GIB": SizeUtils.GB,
-            "T": SizeUtils.TB,
-            "TB": SizeUtils.TB,
-            "TIB": SizeUtils.TB
-        }
-        
         try:
             # 找到数字和单位
-            import re
-            match = re.match(r"([\d.]+)\s*([A-Za-z]+)", size_str)
+            match = _SIZE_RE.match(size_str)
             
             if match:
                 size_val = float(match.group(1))
-                unit = match.group(2).upper()
+                unit = match.group(2)
                 
                 # 计算字节数
-                if unit in units:
-                    return int(size_val * units[unit])
+                if unit in _UNITS:
+                    return int(size_val * _UNITS[unit])
                 else:
                     # 如果单位不识别，假设为字节
                     return int(size_val)
@@ -144,13 +189,21 @@ class SizeUtils:
         返回:
             int: 总大小（字节）
         """
-        # 过滤无效值
-        valid_sizes = [size for size in sizes if isinstance(size, (int, float)) and size >= 0]
+        # 过滤无效值，使用生成器避免构造中间列表
+        return sum(size for size in sizes if SizeUtils._is_valid_size(size))
         
-        if not valid_sizes:
-            return 0
+    @staticmethod
+    def _is_valid_size(size) -> bool:
+        """
+        判断是否为可计入总和的大小值
+        
+        参数:
+            size: 大小值
             
-        return sum(valid_sizes)
+        返回:
+            bool: 是否为非负的数值
+        """
+        return isinstance(size, (int, float)) and size >= 0
         
     @staticmethod
     def get_size_category(size_in_bytes: int) -> str:
@@ -166,19 +219,8 @@ class SizeUtils:
         if size_in_bytes < 0:
             return "未知"
             
-        if size_in_bytes == 0:
-            return "空"
-            
-        if size_in_bytes < 10 * SizeUtils.KB:  # 10KB以下
-            return "极小"
-        elif size_in_bytes < 1 * SizeUtils.MB:  # 1MB以下
-            return "小"
-        elif size_in_bytes < 100 * SizeUtils.MB:  # 100MB以下
-            return "中等"
-        elif size_in_bytes < 1 * SizeUtils.GB:  # 1GB以下
-            return "大"
-        else:  # 1GB及以上
-            return "极大"
+        # 0为空，10KB以下极小，1MB以下小，100MB以下中等，1GB以下大，1GB及以上极大
+        return _CAT_LABELS[bisect.bisect_right(_CAT_THRESHOLDS, size_in_bytes)]
             
     @staticmethod
     def parse_size_filter(size_filter: str) -> Tuple[int, int]:
@@ -256,14 +298,29 @@ class SizeUtils:
         返回:
             Dict[str, Tuple[int, str]]: 名称、大小和百分比的字典
         """
-        result = {}
-        
-        # 计算总大小
-        total_size = SizeUtils.add_sizes(list(sizes.values()))
+        items = list(sizes.items())
         
-        # 计算每个项目的百分比
-        for name, size in sizes.items():
-            percentage = SizeUtils.format_percentage(size, total_size)
-            result[name] = (size, percentage)
+        # 计算总大小，与add_sizes一样只统计有效的大小值，并记录被忽略的项目
+        total_size = 0
+        excluded = set()
+        for name, size in items:
+            if SizeUtils._is_valid_size(size):
+                total_size += size
+            else:
+                excluded.add(name)
+                
+        if total_size <= 0:
+            return {name: (size, "0%") for name, size in items}
+            
+        # 计算每个项目的百分比，与format_percentage的格式一致，未计入总大小的项目为0%
+        result = {}
+        for name, size in items:
+            if name in excluded:
+                result[name] = (size, "0%")
+                continue
+            percentage = f"{size / total_size * 100:.1f}"
+            if percentage.endswith(".0"):
+                percentage = percentage[:-2]
+            result[name] = (size, percentage + "%")
             
         return result 
\ No newline at end of file
@@ -3,11 +3,21 @@
 """
 import os
 import platform
-import sys
 import psutil
 import tempfile
 import shutil
-from pathlib import Path
+from utils import _env
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 操作系统类型在运行期间不会改变，只在导入时获取一次
+_SYSTEM = platform.system().lower()
+
+# 系统主临时目录在运行期间不会改变，只获取一次
+_TEMP_DIR = tempfile.gettempdir()
 
 class SystemUtils:
     """系统工具类，提供获取系统信息和系统路径的方法"""
@@ -20,7 +30,7 @@ class SystemUtils:
         返回值:
             str: 'windows', 'darwin' (MacOS), 'linux' 中的一个
         """
-        return platform.system().lower()
+        return _SYSTEM
     
     @staticmethod
     def is_windows():
@@ -30,7 +40,7 @@ class SystemUtils:
         返回值:
             bool: 是Windows则返回True，否则返回False
         """
-        return platform.system().lower() == 'windows'
+        return _SYSTEM == 'windows'
     
     @staticmethod
     def is_macos():
@@ -40,7 +50,7 @@ class SystemUtils:
         返回值:
             bool: 是MacOS则返回True，否则返回False
         """
-        return platform.system().lower() == 'darwin'
+        return _SYSTEM == 'darwin'
     
     @staticmethod
     def is_linux():
@@ -50,7 +60,47 @@ class SystemUtils:
         返回值:
             bool: 是Linux则返回True，否则返回False
         """
-        return platform.system().lower() == 'linux'
+        return _SYSTEM == 'linux'
+    
+    @staticmethod
+    def filter_existing_dirs(paths):
+        """
+        过滤出存在的目录，同一父目录下的候选目录只列出一次父目录，不逐个调用stat
+        
+        参数:
+            paths (list): 候选目录路径列表
+            
+        返回值:
+            list: 存在的目录路径列表，保持原有顺序
+        """
+        listings = {}
+        existing = []
+        
+        for path in paths:
+            parent, name = os.path.split(path)
+            if not parent or not name:
+                # 根目录或相对路径，直接检查
+                if os.path.isdir(path):
+                    existing.append(path)
+                continue
+                
+            listing = listings.get(parent)
+            if listing is None:
+                try:
+                    with os.scandir(parent) as it:
+                        listing = {os.path.normcase(entry.name): entry for entry in it}
+                except OSError:
+                    listing = {}
+                listings[parent] = listing
+                
+            entry = listing.get(os.path.normcase(name))
+            try:
+                if entry is not None and entry.is_dir():
+                    existing.append(path)
+            except OSError:
+                pass
+                
+        return existing
     
     @staticmethod
     def get_temp_directories():
@@ -63,30 +113,30 @@ class SystemUtils:
         temp_dirs = []
         
         # 添加系统临时目录
-        temp_dirs.append(tempfile.gettempdir())
+        temp_dirs.append(_TEMP_DIR)
         
         # 根据不同系统添加特定的临时目录
         system = SystemUtils.get_system_type()
         
         if system == 'windows':
             # Windows临时目录
-            temp_dirs.append(os.path.join(os.environ.get('SYSTEMROOT', 'C:\\Windows'), 'Temp'))
-            temp_dirs.append(os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Temp'))
+            temp_dirs.append(os.path.join(_env.SYSTEMROOT, 'Temp'))
+            temp_dirs.append(os.path.join(_env.LOCALAPPDATA, 'Temp'))
             
         elif system == 'darwin':
             # MacOS临时目录
             temp_dirs.append('/private/tmp')
             temp_dirs.append('/private/var/tmp')
-            temp_dirs.append(os.path.expanduser('~/Library/Caches'))
+            temp_dirs.append(os.path.join(_env.HOME, 'Library', 'Caches'))
             
         elif system == 'linux':
             # Linux临时目录
             temp_dirs.append('/tmp')
             temp_dirs.append('/var/tmp')
-            temp_dirs.append(os.path.expanduser('~/.cache'))
+            temp_dirs.append(os.path.join(_env.HOME, '.cache'))
             
         # 过滤掉不存在的目录
-        return [d for d in temp_dirs if os.path.exists(d)]
+        return SystemUtils.filter_existing_dirs(temp_dirs)
     
     @staticmethod
     def get_downloads_directory():
@@ -99,13 +149,13 @@ class SystemUtils:
         system = SystemUtils.get_system_type()
         
         if system == 'windows':
-            return os.path.join(os.path.expanduser('~'), 'Downloads')
+            return os.path.join(_env.HOME, 'Downloads')
         elif system == 'darwin':
-            return os.path.join(os.path.expanduser('~'), 'Downloads')
+            return os.path.join(_env.HOME, 'Downloads')
         elif system == 'linux':
-            return os.path.join(os.path.expanduser('~'), 'Downloads')
+            return os.path.join(_env.HOME, 'Downloads')
         else:
-            return os.path.expanduser('~')
+            return _env.HOME
     
     @staticmethod
     def get_browser_cache_directories():
@@ -116,12 +166,12 @@ class SystemUtils:
             list: 浏览器缓存目录路径列表
         """
         cache_dirs = []
-        home = os.path.expanduser('~')
+        home = _env.HOME
         system = SystemUtils.get_system_type()
         
         if system == 'windows':
             # Windows浏览器缓存目录
-            appdata = os.environ.get('LOCALAPPDATA', '')
+            appdata = _env.LOCALAPPDATA
             cache_dirs.extend([
                 # Chrome
                 os.path.join(appdata, 'Google', 'Chrome', 'User Data', 'Default', 'Cache'),
@@ -152,7 +202,7 @@ class SystemUtils:
             ])
             
         # 过滤掉不存在的目录
-        return [d for d in cache_dirs if os.path.exists(d)]
+        return SystemUtils.filter_existing_dirs(cache_dirs)
     
     @staticmethod
     def get_disk_usage(path=None):
@@ -184,11 +234,10 @@ class SystemUtils:
         返回值:
             str: 格式化后的大小字符串 (例如: "1.23 MB")
         """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
+        units = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+        # 用二进制位数直接得到单位，不需要逐级除以1024
+        i = max(0, min((int(size_bytes).bit_length() - 1) // 10, len(units) - 1))
+        return f"{size_bytes / (1 << (10 * i)):.2f} {units[i]}"
     
     @staticmethod
     def get_process_list():
@@ -198,19 +247,154 @@ class SystemUtils:
         返回值:
             list: 进程信息列表，每个元素为一个字典，包含进程ID、名称和内存使用量
         """
-        processes = []
+        return [
+            {'pid': pid, 'name': name, 'memory': memory}
+            for pid, name, memory in SystemUtils._iter_processes()
+        ]
+    
+    @staticmethod
+    def get_process_arrays():
+        """
+        以并列数组的形式获取当前运行的进程，适合按内存排序或筛选等批量操作
+        
+        返回值:
+            tuple: (进程ID数组, 进程名称列表, 内存使用量数组)，
+                numpy可用时两个数组为int64的numpy数组，否则为列表
+        """
+        pids = []
+        names = []
+        memories = []
+        
+        for pid, name, memory in SystemUtils._iter_processes():
+            pids.append(pid)
+            names.append(name)
+            memories.append(memory)
+            
+        if np is None:
+            return pids, names, memories
+            
+        return np.array(pids, dtype=np.int64), names, np.array(memories, dtype=np.int64)
+    
+    @staticmethod
+    def get_top_memory_processes(count=10):
+        """
+        获取内存使用量最大的进程
+        
+        参数:
+            count (int): 返回的进程数量
+            
+        返回值:
+            list: 进程信息列表，格式与get_process_list相同，按内存使用量从大到小排序
+        """
+        pids, names, memories = SystemUtils.get_process_arrays()
+        count = min(count, len(names))
+        if count <= 0:
+            return []
+            
+        if np is None:
+            order = sorted(range(len(names)), key=memories.__getitem__, reverse=True)[:count]
+        else:
+            # 先用argpartition选出前count个，再只对这部分排序
+            top = np.argpartition(memories, -count)[-count:]
+            order = top[np.argsort(memories[top])[::-1]]
+            
+        return [
+            {'pid': int(pids[i]), 'name': names[i], 'memory': int(memories[i])}
+            for i in order
+        ]
+    
+    @staticmethod
+    def _iter_processes():
+        """
+        遍历当前运行的进程
+        
+        返回值:
+            generator: 依次产生 (进程ID, 进程名称, 内存使用量) 元组
+        """
+        # Linux上直接解析/proc，避免为每个进程构造psutil.Process对象
+        if _SYSTEM == 'linux' and os.path.isdir('/proc'):
+            yield from SystemUtils._iter_processes_from_proc()
+            return
+            
         for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
             try:
                 process_info = proc.info
-                processes.append({
-                    'pid': process_info['pid'],
-                    'name': process_info['name'],
-                    'memory': process_info['memory_info'].rss if process_info['memory_info'] else 0
-                })
+                yield (
+                    process_info['pid'],
+                    process_info['name'],
+                    process_info['memory_info'].rss if process_info['memory_info'] else 0
+                )
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
-        return processes
     
+    @staticmethod
+    def _iter_processes_from_proc():
+        """
+        通过解析/proc/<pid>/stat遍历进程（仅Linux），每个进程通常只读取一次文件
+        
+        内核将stat中的进程名截断为15个字符，这种情况下与psutil一样从cmdline中取完整名称
+        
+        返回值:
+            generator: 依次产生 (进程ID, 进程名称, 内存使用量) 元组
+        """
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        
+        with os.scandir('/proc') as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                    
+                try:
+                    with open(f'/proc/{entry.name}/stat', 'rb', buffering=0) as f:
+                        data = f.read()
+                except OSError:
+                    # 进程已退出或无权访问
+                    continue
+                    
+                # 格式为 "pid (comm) state ..."，进程名中可能包含空格和括号
+                left = data.find(b'(')
+                right = data.rfind(b')')
+                if left < 0 or right < 0:
+                    continue
+                    
+                fields = data[right + 2:].split()
+                if len(fields) < 22:
+                    continue
+                    
+                name = data[left + 1:right].decode('utf-8', 'replace')
+                if len(name) >= 15:
+                    name = SystemUtils._get_full_process_name(entry.name, name)
+                    
+                # 第24个字段为常驻内存页数，fields从第3个字段开始
+                yield (
+                    int(entry.name),
+                    name,
+                    int(fields[21]) * page_size
+                )
+        
+    @staticmethod
+    def _get_full_process_name(pid, comm):
+        """
+        从/proc/<pid>/cmdline获取被截断的进程名的完整名称
+        
+        参数:
+            pid (str): 进程ID
+            comm (str): stat中被截断的进程名
+            
+        返回值:
+            str: 完整的进程名称，无法获取时返回comm
+        """
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb', buffering=0) as f:
+                cmdline = f.read()
+        except OSError:
+            return comm
+            
+        exe = os.path.basename(cmdline.split(b'\0', 1)[0].decode('utf-8', 'replace'))
+        if exe.startswith(comm):
+            return exe
+        return comm
+        
     @staticmethod
     def get_temp_dir():
         """
@@ -219,7 +403,7 @@ class SystemUtils:
         返回值:
             str: 临时目录路径
         """
-        return tempfile.gettempdir()
+        return _TEMP_DIR
         
     @staticmethod
     def get_log_dirs():
@@ -234,18 +418,18 @@ class SystemUtils:
         
         if system == 'windows':
             # Windows日志目录
-            log_dirs.append(os.path.join(os.environ.get('SYSTEMROOT', 'C:\\Windows'), 'Logs'))
-            log_dirs.append(os.path.join(os.environ.get('SYSTEMROOT', 'C:\\Windows'), 'debug'))
+            log_dirs.append(os.path.join(_env.SYSTEMROOT, 'Logs'))
+            log_dirs.append(os.path.join(_env.SYSTEMROOT, 'debug'))
         elif system == 'darwin':
             # MacOS日志目录
             log_dirs.append('/var/log')
-            log_dirs.append(os.path.expanduser('~/Library/Logs'))
+            log_dirs.append(os.path.join(_env.HOME, 'Library', 'Logs'))
         elif system == 'linux':
             # Linux日志目录
             log_dirs.append('/var/log')
             
         # 过滤掉不存在的目录
-        return [d for d in log_dirs if os.path.exists(d)]
+        return SystemUtils.filter_existing_dirs(log_dirs)
         
     @staticmethod
     def get_recycle_bin_path():
@@ -259,12 +443,12 @@ class SystemUtils:
         
         if system == 'windows':
             # Windows回收站
-            return os.path.join(os.environ.get('SYSTEMDRIVE', 'C:'), '$Recycle.Bin')
+            return os.path.join(_env.SYSTEMDRIVE, '$Recycle.Bin')
         elif system == 'darwin':
             # MacOS回收站
-            return os.path.join(os.path.expanduser('~'), '.Trash')
+            return os.path.join(_env.HOME, '.Trash')
         elif system == 'linux':
             # Linux回收站
-            return os.path.join(os.path.expanduser('~'), '.local', 'share', 'Trash')
+            return os.path.join(_env.HOME, '.local', 'share', 'Trash')
             
         return None 
\ No newline at end of file